@@ -10,9 +10,12 @@ http://framecurve.org/scripts/#license
 
 from __future__ import with_statement
 
+# Only modules that are cheap to import (or always loaded anyway) are
+# imported here. Everything else is imported by the functions using it,
+# so that importing framecurve stays fast for short-lived processes
 import os
-import re
 import math
+import operator
 
 __version__ = (0, 3)
 
@@ -21,12 +24,20 @@ SPEC_URL = "http://framecurve.org/specification-v1"
 COLUMN_HEADER = "at_frame\tuse_frame_of_source"
 
 
+_COMMENT_TEXTS = dict((t, t) for t in (unicode(SPEC_URL), unicode(COLUMN_HEADER)))
+
+
 class FramecurveError(Exception):
     pass
 
 
 class MalformedError(FramecurveError):
-    pass
+    """Raised for a framecurve that does not follow the specification.
+    When it is about a single line of a file, ``lineno`` and ``line``
+    (the raw bytes read) tell which one
+    """
+    lineno = None
+    line = None
 
 
 class Comment(object):
@@ -37,11 +48,21 @@ class Comment(object):
     A comment is a line starting with a hashmark (#).
     """
 
+    __slots__ = ("text", )
+
     def __init__(self, text):
         """``text`` should not include the leading # character
         """
         self.text = text
 
+    def __getstate__(self):
+        # A dict, as pickled before Comment had __slots__. It is never
+        # empty, which pickle protocols 0 and 1 would otherwise drop
+        return {"text": self.text}
+
+    def __setstate__(self, state):
+        self.text = state["text"]
+
     def __repr__(self):
         return "Comment(%r)" % (self.text)
 
@@ -64,30 +85,31 @@ class FrameCorrelation(tuple):
     the format of
 
     [destination_frame_integer][TAB][source_frame_float][CRLF|LF]
+
+    Equality and hashing are those of the ``(at, value)`` tuple. Code
+    going over many records can index or unpack them instead of going
+    through the ``at`` and ``value`` properties
     """
 
+    __slots__ = ()
+
     def __new__(cls, at, value):
-        return super(FrameCorrelation, cls).__new__(cls, (at, value))
+        return tuple.__new__(cls, (at, value))
 
     def __repr__(self):
         return "%s(at=%r, value=%r)" % (
             self.__class__.__name__,
-            self.at,
-            self.value)
+            self[0],
+            self[1])
 
     def __str__(self):
-        return "%d\t%.05f" % (self.at, self.value)
+        return "%d\t%.05f" % self
 
-    def __eq__(self, other):
-        return self.at == other.at and self.value == self.value
+    def __getnewargs__(self):
+        return (self[0], self[1])
 
-    @property
-    def at(self):
-        return self[0]
-
-    @property
-    def value(self):
-        return self[1]
+    at = property(operator.itemgetter(0))
+    value = property(operator.itemgetter(1))
 
 
 class Curve(list):
@@ -95,6 +117,8 @@ class Curve(list):
     FrameCorrelation objects
     """
 
+    _validation = None
+
     def __init__(self, filename=None, values=None):
         """``filename`` is the name this curve represents
 
@@ -111,6 +135,63 @@ class Curve(list):
         if values is not None:
             self.extend(values)
     
+    def append(self, record):
+        list.append(self, record)
+        if self._validation is not None:
+            self._validation_appended(1)
+
+    def extend(self, records):
+        list.extend(self, records)
+        if self._validation is not None:
+            self._validation_appended(len(self) - self._validation.length)
+
+    def _validation_appended(self, count):
+        """
+        Brings the validation state up to date with the last ``count``
+        records, or detaches it if it belongs to another curve (such as
+        the one this curve was copied from)
+        """
+        state = self._validation
+        if state.curve is not self or state.length != len(self) - count:
+            self._detach_validation()
+            return
+
+        for idx in xrange(len(self) - count, len(self)):
+            state._track(self[idx])
+
+    def validation_state(self):
+        """
+        Returns a ValidationState with the same results as a Validator
+        for this curve, which is kept up to date as records are appended
+
+        >>> c = Curve()
+        >>> c.add_frame(2, 1.0)
+        >>> state = c.validation_state()
+        >>> state.ok
+        True
+        >>> c.add_frame(1, 2.0)
+        >>> state.errors == Validator(curve = c).errors
+        True
+        >>> state.ok
+        False
+        """
+        state = self._validation
+        if state is None or state.curve is not self or state.length != len(self):
+            if state is not None:
+                self._detach_validation()
+            state = self._validation = ValidationState(self)
+        return state
+
+    def _detach_validation(self):
+        """
+        Drops the ValidationState of this curve, which can then no longer
+        be read since it does not follow the records anymore
+        """
+        state = self._validation
+        self._validation = None
+        if state.curve is self:
+            state.curve = None
+
     def add_frame(self, at, value):
         """
         Adds a frame correlation with the passed values
@@ -128,6 +209,77 @@ class Curve(list):
             if isinstance(record, FrameCorrelation):
                 yield record
 
+    def window(self, start_at, end_at, interpolate=False):
+        """
+        Returns a CurveWindow over the records from frame ``start_at`` to
+        ``end_at`` inclusive. The frames must be properly sequenced, since
+        the window boundaries are found by binary search. With
+        ``interpolate``, keyframes are interpolated on the boundaries
+        the curve has no keyframe on
+
+        >>> c = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(5, 5.0), FrameCorrelation(9, 13.0)])
+        >>> list(c.window(2, 5))
+        [FrameCorrelation(at=5, value=5.0)]
+        >>> list(c.window(2, 7, interpolate = True))
+        [FrameCorrelation(at=2, value=2.0), FrameCorrelation(at=5, value=5.0), FrameCorrelation(at=7, value=9.0)]
+        """
+        start = _bisect_frames(self, start_at)
+        stop = max(start, _bisect_frames(self, end_at, right=True))
+        head, tail = None, None
+
+        if interpolate and start_at <= end_at:
+            before = _frame_before(self, start)
+            first = _frame_from(self, start)
+            if before is not None and first is not None and first[0] != start_at:
+                head = _interpolate(before, first, start_at)
+
+            last = _frame_before(self, stop)
+            after = _frame_from(self, stop)
+            if last is not None and after is not None and last[0] != end_at:
+                tail = _interpolate(last, after, end_at)
+
+            # A one frame window between keyframes only needs one key
+            if head is not None and tail is not None and head[0] == tail[0]:
+                tail = None
+
+        return CurveWindow(self, start, stop, head, tail)
+
+    def to_numpy(self, structured=False):
+        """
+        Returns the frames and values of the frame correlations as two NumPy
+        arrays, or as one structured array with ``at`` and ``value`` fields
+        if ``structured`` is set. Requires NumPy
+        """
+        import numpy
+
+        records = numpy.array(list(self.frames()), dtype=_NUMPY_RECORD)
+        if structured:
+            return records
+        return records["at"], records["value"]
+
+    @classmethod
+    def from_numpy(cls, at, value, comments=None, filename=None):
+        """
+        Makes a Curve from sequences (such as NumPy arrays) of frames and
+        values, preceded by a Comment for each string in ``comments``
+        """
+        if len(at) != len(value):
+            raise ValueError("Got %d frames but %d values" % (len(at), len(value)))
+        if hasattr(at, "tolist"):
+            at, value = at.tolist(), value.tolist()
+
+        curve = cls(filename=filename)
+        if comments is not None:
+            curve.extend([Comment(text) for text in comments])
+        curve.extend(map(_frame, map(int, at), map(float, value)))
+        return curve
+
+    def freeze(self):
+        """
+        Returns an immutable FrozenCurve with the same records
+        """
+        return FrozenCurve(filename=self.filename, values=self)
+
     def __eq__(self, other):
         same_fname = self.filename == self.filename
         same_values = list.__eq__(self, other)
@@ -135,12 +287,415 @@ class Curve(list):
         return same_fname and same_values
 
 
+_NUMPY_RECORD = [("at", "i8"), ("value", "f8")]
+
+
+class FrozenCurve(tuple):
+    """An immutable and hashable Curve, as returned by ``Curve.freeze``.
+
+    The frame and value lookup arrays, the validation result and the
+    simplified frames are all computed once when the FrozenCurve is made,
+    so it can be shared and read from many threads without locking
+
+    >>> c = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(3, 5.0)])
+    >>> frozen = c.freeze()
+    >>> frozen.evaluate(2)
+    3.0
+    >>> frozen.ok
+    True
+    """
+
+    def __new__(cls, filename=None, values=()):
+        self = super(FrozenCurve, cls).__new__(cls, values)
+
+        set_attr = super(FrozenCurve, self).__setattr__
+        set_attr("filename", filename)
+
+        # Sorted for lookups, even if the records are out of order
+        frames = sorted([x for x in self if isinstance(x, FrameCorrelation)],
+                        key=operator.itemgetter(0))
+        v = Validator(curve=self)
+
+        set_attr("ats", tuple([f[0] for f in frames]))
+        set_attr("values", tuple([f[1] for f in frames]))
+        set_attr("errors", tuple(v.errors))
+        set_attr("warnings", tuple(v.warnings))
+        set_attr("simplified", tuple(simplify(self)))
+        # Comments compared by their text, as Comment can only be
+        # compared with another Comment
+        set_attr("_key", (filename, tuple([
+                        (x.text if isinstance(x, Comment) else x) for x in self])))
+        set_attr("_hash", hash(self._key))
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenCurve objects can not be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenCurve objects can not be changed")
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenCurve) and self._key == other._key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def perfect(self):
+        return len(self.warnings) == 0 and len(self.errors) == 0
+
+    @property
+    def ok(self):
+        return len(self.errors) == 0
+
+    def frames(self):
+        for record in self:
+            if isinstance(record, FrameCorrelation):
+                yield record
+
+    def evaluate(self, at):
+        """
+        Returns the source frame used at frame ``at``, interpolated
+        between the keyframes in frame order. Of keyframes on the same
+        frame, the last one is used
+        """
+        return _evaluate(self.ats, self.values, at)
+
+    def to_numpy(self, structured=False):
+        """
+        Returns the frames and values as NumPy arrays, see Curve.to_numpy
+        """
+        return _arrays_to_numpy(self.ats, self.values, structured)
+
+    def thaw(self):
+        """
+        Returns a mutable Curve with the same records
+        """
+        return Curve(filename=self.filename, values=self)
+
+
+def _detaching_validation(method):
+    """
+    Wraps a list method changing the records of a Curve, so that it
+    detaches the Curve's ValidationState
+    """
+    def _wrapper(self, *args, **kwargs):
+        if self._validation is not None:
+            self._detach_validation()
+        return method(self, *args, **kwargs)
+
+    _wrapper.__name__ = method.__name__
+    _wrapper.__doc__ = method.__doc__
+    return _wrapper
+
+
+for _name in ("insert", "pop", "remove", "sort", "reverse", "__setitem__",
+              "__delitem__", "__setslice__", "__delslice__", "__iadd__", "__imul__"):
+    setattr(Curve, _name, _detaching_validation(getattr(list, _name)))
+del _name
+
+
+class CurveWindow(object):
+    """A read-only view over a range of the records of a Curve, as
+    returned by ``Curve.window``. The records are not copied, so the
+    window should not be used after the curve has been changed. It can
+    be read by anything reading a curve (``serialize``, ``validate``,
+    the exporters...), and has the filename of the curve.
+
+    Comments go with the keyframe they come before: a window has the
+    comments between the keyframe before its range and its first
+    keyframe, but not the ones after its last keyframe
+    """
+
+    def __init__(self, curve, start, stop, head=None, tail=None):
+        self.curve = curve
+        self.start = start
+        self.stop = stop
+        self.head = head
+        self.tail = tail
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self))
+
+    def __len__(self):
+        return (self.stop - self.start
+                + (self.head is not None) + (self.tail is not None))
+
+    def __iter__(self):
+        if self.head is not None:
+            yield self.head
+        for idx in xrange(self.start, self.stop):
+            yield self.curve[idx]
+        if self.tail is not None:
+            yield self.tail
+
+    @property
+    def filename(self):
+        return self.curve.filename
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in xrange(*idx.indices(len(self)))]
+
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError("CurveWindow index out of range")
+
+        if self.head is not None:
+            if idx == 0:
+                return self.head
+            idx -= 1
+        if idx == self.stop - self.start:
+            return self.tail
+        return self.curve[self.start + idx]
+
+    def frames(self):
+        for record in self:
+            if isinstance(record, FrameCorrelation):
+                yield record
+
+    def to_curve(self):
+        """
+        Copies the records of the window into a new Curve
+        """
+        return Curve(filename=self.curve.filename, values=self)
+
+
+class SharedCurve(object):
+    """The frame correlations of a Curve, copied once into shared memory
+    so that many worker processes can read them without every one of
+    them getting its own pickled copy of the curve.
+
+    Hand it to the workers when they are started, for instance with
+    ``multiprocessing.Pool(initializer=..., initargs=(shared, ))`` or as
+    an argument of ``multiprocessing.Process``. It can not be sent
+    through a queue or as an argument of ``Pool.map`` and friends.
+
+    The shared memory is released once ``close`` has been called (or the
+    ``with`` block has been left) and the workers are done with it. A
+    closed SharedCurve raises ValueError when it is read
+    """
+
+    closed = False
+
+    def __init__(self, curve):
+        from multiprocessing.sharedctypes import RawArray
+
+        frames = list(curve.frames())
+        self.filename = curve.filename
+        self._ats = RawArray("l", [f[0] for f in frames])
+        self._values = RawArray("d", [f[1] for f in frames])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Drops the reference to the shared memory held by this object
+        """
+        self._ats = None
+        self._values = None
+        self.closed = True
+
+    def _arrays(self):
+        """
+        Returns the shared arrays of frames and values
+        """
+        if self.closed:
+            raise ValueError("SharedCurve is closed")
+        return self._ats, self._values
+
+    def __len__(self):
+        return len(self._arrays()[0])
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError("SharedCurve index out of range")
+        ats, values = self._arrays()
+        return _frame(ats[idx], values[idx])
+
+    def frames(self):
+        return iter(map(_frame, *self._arrays()))
+
+    def evaluate(self, at):
+        """
+        Returns the source frame used at frame ``at``, interpolated
+        between the keyframes
+        """
+        ats, values = self._arrays()
+        return _evaluate(ats, values, at)
+
+    def to_numpy(self, structured=False):
+        """
+        Returns read-only NumPy arrays of the frames and values. Unless
+        ``structured`` is set these point straight into the shared memory
+        without copying, so they are only usable until the SharedCurve
+        is closed
+        """
+        ats, values = self._arrays()
+        if structured:
+            return _arrays_to_numpy(ats, values, structured)
+
+        import numpy.ctypeslib
+        ats = numpy.ctypeslib.as_array(ats)
+        values = numpy.ctypeslib.as_array(values)
+        ats.flags.writeable = False
+        values.flags.writeable = False
+        return ats, values
+
+    def to_curve(self):
+        """
+        Copies the frame correlations into a new Curve
+        """
+        return Curve(filename=self.filename, values=self.frames())
+
+
+def share(curve):
+    """
+    Copies the frame correlations of a curve into shared memory for
+    worker processes, see SharedCurve
+    """
+    return SharedCurve(curve)
+
+
+def _arrays_to_numpy(ats, values, structured):
+    """
+    Turns sequences of frames and values into NumPy arrays, in the form
+    returned by ``to_numpy``
+    """
+    import numpy
+
+    if not structured:
+        return numpy.array(ats, dtype="i8"), numpy.array(values, dtype="f8")
+
+    records = numpy.empty(len(ats), dtype=_NUMPY_RECORD)
+    records["at"] = ats
+    records["value"] = values
+    return records
+
+
+def _evaluate(ats, values, at):
+    """
+    Looks up the source frame at frame ``at`` given sorted sequences of
+    keyframe frames and values, interpolating linearly between keyframes
+    and holding the first and last values
+    """
+    import bisect
+
+    if len(ats) == 0:
+        raise ValueError("Can not evaluate a curve without frame correlation records")
+
+    idx = bisect.bisect_right(ats, at)
+    if idx == 0:
+        return float(values[0])
+    if idx == len(ats):
+        return float(values[-1])
+
+    before_at, after_at = ats[idx - 1], ats[idx]
+    t = (at - before_at) / float(after_at - before_at)
+    return values[idx - 1] + (values[idx] - values[idx - 1]) * t
+
+
+def _bisect_frames(curve, at, right=False):
+    """
+    Binary search for the index of the first FrameCorrelation in the curve
+    that comes at or (with ``right``) after frame ``at``, stepping over
+    comments. Returns the length of the curve if there is none
+    """
+    lo, hi = 0, len(curve)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probe = mid
+        while probe < hi and not isinstance(curve[probe], FrameCorrelation):
+            probe += 1
+
+        if probe == hi:
+            hi = mid
+        elif curve[probe][0] < at or (right and curve[probe][0] == at):
+            lo = probe + 1
+        else:
+            hi = mid
+
+    return lo
+
+
+def _frame_before(curve, idx):
+    """
+    Returns the last FrameCorrelation before index ``idx`` of the curve, or None
+    """
+    for i in xrange(idx - 1, -1, -1):
+        if isinstance(curve[i], FrameCorrelation):
+            return curve[i]
+    return None
+
+
+def _frame_from(curve, idx):
+    """
+    Returns the first FrameCorrelation at or after index ``idx`` of the curve, or None
+    """
+    for i in xrange(idx, len(curve)):
+        if isinstance(curve[i], FrameCorrelation):
+            return curve[i]
+    return None
+
+
+def _key_between(curve, at):
+    """
+    Returns a FrameCorrelation at frame ``at`` interpolated between the
+    keyframes of a properly sequenced curve around it, or None if the
+    curve has a keyframe on that frame or does not have keyframes on
+    both sides of it
+    """
+    idx = _bisect_frames(curve, at)
+    before, after = _frame_before(curve, idx), _frame_from(curve, idx)
+    if before is None or after is None or after[0] == at:
+        return None
+    return _interpolate(before, after, at)
+
+
+def _interpolate(before, after, at):
+    """
+    Returns a FrameCorrelation at frame ``at``, linearly interpolated between two others
+    """
+    t = (at - before[0]) / float(after[0] - before[0])
+    return FrameCorrelation(at, before[1] + (after[1] - before[1]) * t)
+
+
 DELTA = 0.0001
 
 
+class _LazyRegex(object):
+    """A class attribute holding a regular expression, which is only
+    compiled the first time it is used
+    """
+
+    def __init__(self, pattern, verbose=False):
+        self.pattern = pattern
+        self.verbose = verbose
+        self.compiled = None
+
+    def __get__(self, obj, cls):
+        if self.compiled is None:
+            import re
+            self.compiled = re.compile(self.pattern, self.verbose and re.VERBOSE or 0)
+        return self.compiled
+
+
 class Parser(object):
-    COMMENT = re.compile(r"^#(.+)$")
-    CORRELATION_RECORD = re.compile(
+    COMMENT = _LazyRegex(r"^#(.+)$")
+    CORRELATION_RECORD = _LazyRegex(
         r"""
         ^([-]?\d+)            # -42 or 42
         \t                    # tab
@@ -151,7 +706,7 @@ class Parser(object):
         )
         ([eE][+-]?[0-9]+)?    # "1.2e3", "1.2e-3" or "1.2e+3"
         $
-        """, re.VERBOSE)
+        """, verbose=True)
 
     def __init__(self, fileobj):
         r"""fileobj is a file like object (from open() or StringIO etc)
@@ -168,7 +723,12 @@ class Parser(object):
         """
         self.fileobj = fileobj
 
-    def parse(self):
+    def parse(self, errors=None):
+        """Reads the whole file into a Curve. Unless a list is passed
+        as ``errors``, a MalformedError is raised on the first malformed
+        line. With a list, every malformed line is skipped and a
+        MalformedError for it is appended to the list instead
+        """
         filepath = getattr(self.fileobj, "name", None)
         if filepath is None:
             filename = None
@@ -176,33 +736,78 @@ class Parser(object):
             filename = os.path.basename(filepath)
 
         cur = Curve(filename=filename)
+        cur.extend(self.iterparse(errors=errors))
+        return cur
 
-        for i, line in enumerate(self.fileobj):
+    def parse_into(self, ats, values):
+        r"""Writes the frame and the value of every frame correlation
+        into the preallocated sequences ``ats`` and ``values`` (for
+        instance NumPy arrays), skipping comments. Returns the number
+        of frame correlations read
+
+        >>> import StringIO, array
+        >>> ats, values = array.array("l", [0] * 4), array.array("d", [0] * 4)
+        >>> Parser(StringIO.StringIO("# A comment\r\n2\t3.5\r\n4\t6.0")).parse_into(ats, values)
+        2
+        >>> ats[:2], values[:2]
+        (array('l', [2, 4]), array('d', [3.5, 6.0]))
+        """
+        count = 0
+        capacity = min(len(ats), len(values))
+        for record in self.iterparse():
+            if not isinstance(record, FrameCorrelation):
+                continue
+            if count == capacity:
+                raise ValueError(
+                    "The framecurve has more than %d frame correlation records" % (capacity, ))
+            ats[count], values[count] = record
+            count += 1
+
+        return count
+
+    def iterparse(self, errors=None):
+        """Yields the Comment and FrameCorrelation records one at a
+        time as they are read, without building up a Curve. ``errors``
+        works like for ``parse``
+        """
+        # Repeated comments (like the preamble in every file) share
+        # a single string
+        texts = dict(_COMMENT_TEXTS)
+
+        for i, raw_line in enumerate(self.fileobj):
             # From spec, "Each record might only contain valid UTF-8
             # codepoint sequences or ASCII as it's subset"
-            line = line.decode("utf-8")
-
-            # Remove trailing whitespace (and newlines etc)
-            line = line.rstrip()
-
-            m = self.COMMENT.match(line)
-            if m is not None:
-                cur.append(Comment(m.group(1).strip()))
-                continue # next line
-
-            m = self.CORRELATION_RECORD.match(line)
-            if m is not None:
-                cur.append(FrameCorrelation(
+            try:
+                line = raw_line.decode("utf-8")
+            except UnicodeDecodeError:
+                # Not UTF-8, so malformed whatever it says
+                line = raw_line.rstrip()
+            else:
+                # Remove trailing whitespace (and newlines etc)
+                line = line.rstrip()
+
+                m = self.COMMENT.match(line)
+                if m is not None:
+                    text = m.group(1).strip()
+                    yield Comment(texts.setdefault(text, text))
+                    continue # next line
+
+                m = self.CORRELATION_RECORD.match(line)
+                if m is not None:
+                    yield FrameCorrelation(
                         at=int(m.group(1)),
-                        value=float(m.group(2))))
-                continue # next line
+                        value=float(m.group(2) + (m.group(5) or "")))
+                    continue # next line
 
             # Unmatched line, error
             invalid_line_repr = repr(line).lstrip("u")
-            raise MalformedError(
+            error = MalformedError(
                 "Malformed line %d: %s" % (i + 1, invalid_line_repr))
-
-        return cur
+            error.lineno = i + 1
+            error.line = raw_line
+            if errors is None:
+                raise error
+            errors.append(error)
 
 
 def _ensure_preamble(curve):
@@ -231,15 +836,56 @@ def _ensure_preamble(curve):
 
 class Serializer(object):
 
-    def __init__(self, fileobj, curve):
+    # Number of records formatted before every write to the file
+    CHUNK_SIZE = 1024
+
+    def __init__(self, fileobj, curve, precision=5, integral=False):
+        """``precision`` is the number of decimals written for the
+        source frames, or "repr" to write the shortest number that reads
+        back as exactly the same value. With ``integral``, source frames
+        that are whole numbers are written without any decimals
+        """
+        if precision == "repr":
+            value_format = "%r"
+        elif isinstance(precision, (int, long)) and precision >= 0:
+            value_format = "%%.%df" % precision
+        else:
+            raise ValueError("Precision must be a number of decimals or \"repr\", not %r" % (
+                    precision, ))
+
         self.fileobj = fileobj
         self.curve = curve
+        self.precision = precision
+        self.integral = integral
+        self._record_format = "%d\t" + value_format + "\r\n"
 
     def serialize(self):
-        with_preamble = _ensure_preamble(self.curve)
+        import itertools
 
-        for record in with_preamble:
-            self.fileobj.write("%s\r\n" % (record, ))
+        # Only the first records can need a preamble, so there is no
+        # need to copy the whole curve
+        with_preamble = itertools.chain(
+            _ensure_preamble(Curve(values=self.curve[:2])),
+            itertools.islice(self.curve, 2, None))
+
+        record_format = self._record_format
+        integral = self.integral
+
+        def _lines():
+            for record in with_preamble:
+                if not isinstance(record, FrameCorrelation):
+                    yield _to_utf8("%s\r\n" % (record, ))
+                    continue
+
+                value = float(record[1])
+                if integral and not math.isinf(value) and math.floor(value) == value:
+                    yield "%d\t%d\r\n" % (record[0], value)
+                else:
+                    # As a float, since %r of an int or long is not a number
+                    # that reads back (100000000000000000000L)
+                    yield record_format % (record[0], value)
+
+        _write_chunked(self.fileobj.write, _lines(), self.CHUNK_SIZE)
 
     def validate_and_serialize(self):
         v = Validator(curve = self.curve)
@@ -250,6 +896,129 @@ class Serializer(object):
         self.serialize()
 
 
+def _to_utf8(line):
+    """
+    Encodes a line for writing to a file if it is unicode, as comments
+    read from a file are
+    """
+    if isinstance(line, unicode):
+        return line.encode("utf-8")
+    return line
+
+
+class Exporter(object):
+    """Base for writing the frame correlations of a Curve in the
+    format of another application. Subclasses provide ``EXTENSION``,
+    and the ``_header``, ``_record`` and ``_footer`` of the output.
+    ``_record`` always gets the source frame as a float, so that %r
+    writes a number (and not 100000000000000000000L for a long)
+    """
+
+    EXTENSION = None
+
+    def __init__(self, fileobj, curve, simplified=False):
+        """With ``simplified``, the curve is simplified before export
+        """
+        self.fileobj = fileobj
+        self.curve = curve
+        self.simplified = simplified
+
+    def export(self):
+        curve = self.curve
+        if self.simplified:
+            curve = simplify(curve)
+
+        def _lines():
+            yield self._header()
+            for idx, record in enumerate(curve.frames()):
+                yield self._record(idx, (record[0], float(record[1])))
+            yield self._footer()
+
+        _write_chunked(self.fileobj.write, _lines(), Serializer.CHUNK_SIZE)
+
+    def _header(self):
+        return ""
+
+    def _footer(self):
+        return ""
+
+
+class NukeExporter(Exporter):
+    r"""Writes a linearly interpolated Nuke animation curve, to be used
+    as the ``lookup`` of a TimeWarp node
+
+    >>> import StringIO
+    >>> f = StringIO.StringIO()
+    >>> NukeExporter(f, Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(5, 12.5)])).export()
+    >>> f.getvalue()
+    '{curve L x1 1.0 x5 12.5}\n'
+    """
+
+    EXTENSION = ".nuke.txt"
+
+    def _header(self):
+        return "{curve L"
+
+    def _record(self, idx, record):
+        return " x%d %r" % record
+
+    def _footer(self):
+        return "}\n"
+
+
+class CSVExporter(Exporter):
+    """Writes comma separated values, with a header row
+    """
+
+    EXTENSION = ".csv"
+
+    def _header(self):
+        return "at_frame,use_frame_of_source\r\n"
+
+    def _record(self, idx, record):
+        return "%d,%r\r\n" % record
+
+
+class JSONExporter(Exporter):
+    """Writes a JSON object with the filename of the curve and a list
+    of ``{"at": ..., "value": ...}`` objects as ``frames``
+    """
+
+    EXTENSION = ".json"
+
+    def _header(self):
+        import json
+        return '{"filename": %s, "frames": [' % (json.dumps(self.curve.filename), )
+
+    def _record(self, idx, record):
+        return '%s{"at": %d, "value": %r}' % ((idx > 0 and ", " or "", ) + record)
+
+    def _footer(self):
+        return "]}\n"
+
+
+EXPORTERS = {
+    "nuke": NukeExporter,
+    "csv": CSVExporter,
+    "json": JSONExporter,
+    }
+
+
+def _write_chunked(write, lines, chunk_size):
+    """
+    Writes the strings from the ``lines`` iterable, joining up to
+    ``chunk_size`` of them for every call to ``write``
+    """
+    import itertools
+
+    lines = iter(lines)
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if len(chunk) == 0:
+            break
+        write("".join(chunk))
+
+
 class Validator(object):
     """Validates a framecurve file, according to
     http://framecurve.org/specification-v1.html
@@ -318,8 +1087,11 @@ class Validator(object):
     def _verify_at_least_one_tuple(self, crv):
         tuples = [x for x in crv if isinstance(x, FrameCorrelation)]
         if len(tuples) == 0:
-            self.errors.append(
-                "The framecurve did not contain any frame correlation records")
+            self._report_no_tuples()
+
+    def _report_no_tuples(self):
+        self.errors.append(
+            "The framecurve did not contain any frame correlation records")
 
     def _verify_filename(self, crv):
         if crv.filename is None:
@@ -332,44 +1104,51 @@ class Validator(object):
                     crv.filename))
 
     def _verify_no_duplicate_records(self, crv):
-        dupes = []
-        tuples = [x for x in crv if isinstance(x, FrameCorrelation)]
-        all_ats = [x.at for x in tuples]
-        uniq_ats = set(all_ats)
-        dupes = [(x, all_ats.count(x)) for x in sorted(uniq_ats) if all_ats.count(x) > 1]
+        counts = {}
+        for x in crv:
+            if isinstance(x, FrameCorrelation):
+                counts[x[0]] = counts.get(x[0], 0) + 1
+
+        self._report_duplicates(counts, [x for x in counts if counts[x] > 1])
 
-        for dupe_frame, dupe_count in dupes:
+    def _report_duplicates(self, counts, dupe_frames):
+        for dupe_frame in sorted(dupe_frames):
             self.errors.append(
                 "The framecurve contains the same frame (%d) twice or more (%d times)" % (
-                    dupe_frame, dupe_count))
+                    dupe_frame, counts[dupe_frame]))
 
     def _verify_proper_sequencing(self, crv):
         tuples = [x for x in crv if isinstance(x, FrameCorrelation)]
-        frame_numbers = [x.at for x in tuples]
+        frame_numbers = [x[0] for x in tuples]
         proper_sequence = sorted(frame_numbers)
 
-        # TODO: Flatten sequences to 1-22 or 1-4,6-22 etc
-
         if frame_numbers != proper_sequence:
-            self.errors.append(
-                "The frame sequencing is out of order "
-                "(expected %s but got %s)."
-                " The framecurve spec mandates that frames are recorded sequentially" % (
-                    proper_sequence,
-                    frame_numbers))
+            self._report_sequencing(frame_numbers, proper_sequence)
+
+    def _report_sequencing(self, frame_numbers, proper_sequence):
+        # TODO: Flatten sequences to 1-22 or 1-4,6-22 etc
+        self.errors.append(
+            "The frame sequencing is out of order "
+            "(expected %s but got %s)."
+            " The framecurve spec mandates that frames are recorded sequentially" % (
+                proper_sequence,
+                frame_numbers))
 
     def _verify_non_negative_source_and_destination_frames(self, crv):
         for i, item in enumerate(crv):
             if not isinstance(item, FrameCorrelation):
                 continue # skip
 
-            line_no = i + 1
+            self._report_negative(i + 1, item)
 
-            if item.at < 1:
-                self.errors.append(
-                    "The line %d had it's at_frame value (%d) below 1. The spec mandates at_frame >= 1." % (line_no, item.at))
-            elif item.value < 0:
-                self.errors.append("The line %d had a use_frame_of_source value (%.5f) below 0. The spec mandates use_frame_of_source >= 0." % (line_no, item.value))
+    def _report_negative(self, line_no, item):
+        at, value = item
+
+        if at < 1:
+            self.errors.append(
+                "The line %d had it's at_frame value (%d) below 1. The spec mandates at_frame >= 1." % (line_no, at))
+        elif value < 0:
+            self.errors.append("The line %d had a use_frame_of_source value (%.5f) below 0. The spec mandates use_frame_of_source >= 0." % (line_no, value))
 
     def _recommend_proper_preamble(self, crv):
         if len(crv) > 0 and isinstance(crv[0], Comment) and SPEC_URL in crv[0].text:
@@ -387,6 +1166,110 @@ class Validator(object):
                 "It is recommended for the second comment to provide a column header")
 
 
+class ValidationState(object):
+    """The validation result of a Curve, kept up to date while frames
+    are appended to it, as returned by ``Curve.validation_state``.
+
+    ``errors``, ``warnings``, ``ok`` and ``perfect`` are the same as those
+    of a Validator for the curve, but appending a record only updates a
+    few counters instead of validating the whole curve again. Any other
+    change to the curve (inserting, removing, sorting...) detaches the
+    state, which raises a ValueError when read from then on, and the next
+    call to ``Curve.validation_state`` scans the curve again
+    """
+
+    def __init__(self, curve):
+        self.curve = curve
+        self.length = 0
+        self.frame_numbers = []
+        self.descents = 0
+        self.counts = {}
+        self.dupe_frames = set()
+        self.negatives = []
+        self._results = None
+
+        for record in curve:
+            self._track(record)
+
+    def _track(self, record):
+        """
+        Updates the counters for a record added to the end of the curve
+        """
+        self.length += 1
+        self._results = None
+        if not isinstance(record, FrameCorrelation):
+            return
+
+        at, value = record
+        if len(self.frame_numbers) > 0 and at < self.frame_numbers[-1]:
+            self.descents += 1
+        self.frame_numbers.append(at)
+
+        count = self.counts.get(at, 0) + 1
+        self.counts[at] = count
+        if count == 2:
+            self.dupe_frames.add(at)
+
+        if at < 1 or value < 0:
+            self.negatives.append((self.length, record))
+
+    def _check(self):
+        if self.curve is None:
+            raise ValueError("ValidationState is detached from its curve, "
+                             "which changed since")
+        # The extension check depends on the filename, which may change
+        if self._results is None or self._results[0] != self.curve.filename:
+            v = _StateValidator(self)
+            self._results = self.curve.filename, v.errors, v.warnings
+        return self._results[1:]
+
+    @property
+    def errors(self):
+        return list(self._check()[0])
+
+    @property
+    def warnings(self):
+        return list(self._check()[1])
+
+    @property
+    def perfect(self):
+        errors, warnings = self._check()
+        return len(warnings) == 0 and len(errors) == 0
+
+    @property
+    def ok(self):
+        return len(self._check()[0]) == 0
+
+
+class _StateValidator(Validator):
+    """A Validator which takes everything that would need a scan of
+    the curve from a ValidationState
+    """
+
+    def __init__(self, state):
+        self.fileobj = None
+        self.state = state
+        self.warnings = []
+        self.errors = []
+        self._validate_crv(state.curve)
+
+    def _verify_at_least_one_tuple(self, crv):
+        if len(self.state.frame_numbers) == 0:
+            self._report_no_tuples()
+
+    def _verify_no_duplicate_records(self, crv):
+        self._report_duplicates(self.state.counts, self.state.dupe_frames)
+
+    def _verify_proper_sequencing(self, crv):
+        if self.state.descents > 0:
+            frame_numbers = self.state.frame_numbers
+            self._report_sequencing(frame_numbers, sorted(frame_numbers))
+
+    def _verify_non_negative_source_and_destination_frames(self, crv):
+        for line_no, item in self.state.negatives:
+            self._report_negative(line_no, item)
+
+
 def parse(fileobj):
     """Parse a file-like object or a file-path
     """
@@ -396,6 +1279,81 @@ def parse(fileobj):
     return Parser(fileobj).parse()
 
 
+def iterparse(fileobj):
+    """Iterate over the records of a file-like object or a file-path,
+    one at a time
+    """
+    if isinstance(fileobj, basestring):
+        fileobj = open(fileobj)
+
+    return Parser(fileobj).iterparse()
+
+
+def evaluate(fileobj, at):
+    """Returns the source frame used at frame ``at`` by the framecurve in
+    a file-like object or a file-path, interpolating between keyframes
+    like ``FrozenCurve.evaluate``. Only the lines up to the first keyframe
+    after ``at`` are read, and no Curve is built, which makes it the
+    quickest way to look up a single frame. Comments are skipped without
+    being checked, so use ``validate`` to find out if the file is valid
+    """
+    if isinstance(fileobj, basestring):
+        with open(fileobj) as f:
+            return evaluate(f, at)
+
+    match = Parser.CORRELATION_RECORD.match
+    before = None
+    for i, line in enumerate(fileobj):
+        if line.startswith("#"):
+            continue
+
+        m = match(line.rstrip())
+        if m is None:
+            raise MalformedError(
+                "Malformed line %d: %s" % (i + 1, repr(line.rstrip()).lstrip("u")))
+
+        record = (int(m.group(1)), float(m.group(2) + (m.group(5) or "")))
+        if before is not None and record[0] < before[0]:
+            raise MalformedError(
+                "The frame sequencing is out of order (frame %d follows frame %d)" % (
+                    record[0], before[0]))
+
+        # Reading on past keyframes on ``at`` itself, since the last of
+        # them is used
+        if record[0] > at:
+            if before is None:
+                return record[1]
+            if before[0] == at:
+                return before[1]
+            return _interpolate(before, record, at)[1]
+        before = record
+
+    if before is None:
+        raise MalformedError("The framecurve did not contain any frame correlation records")
+    return before[1]
+
+
+def parse_tolerant(fileobj):
+    r"""Parse a file-like object or a file-path, skipping malformed lines.
+    Returns the Curve made from the well-formed lines, together with a
+    list of MalformedError objects for the others, which know their
+    ``lineno`` and raw ``line``
+
+    >>> import StringIO
+    >>> curve, errors = parse_tolerant(StringIO.StringIO("1\t1.0\nfoo\n2\t2.0\n3\tbar\n"))
+    >>> curve
+    [FrameCorrelation(at=1, value=1.0), FrameCorrelation(at=2, value=2.0)]
+    >>> [(e.lineno, e.line) for e in errors]
+    [(2, 'foo\n'), (4, '3\tbar\n')]
+    """
+    if isinstance(fileobj, basestring):
+        fileobj = open(fileobj)
+
+    errors = []
+    curve = Parser(fileobj).parse(errors=errors)
+    return curve, errors
+
+
 def parse_str(string):
     """Parse a string containing a Framecurve
     """
@@ -436,28 +1394,304 @@ def validate_str(string):
     return Validator(fileobj = StringIO.StringIO(string))
 
 
-def serialize(fileobj, curve):
+def serialize(fileobj, curve, precision=5, integral=False):
     """
-    Serializes a passed Curve object and writes out to the passed IO handle
+    Serializes a passed Curve object and writes out to the passed IO handle.
+    See Serializer for ``precision`` and ``integral``
     """
     if isinstance(fileobj, basestring):
-        fileobj = open(fileobj)
+        with open(fileobj, "wb") as f:
+            return serialize(f, curve, precision, integral)
 
-    s = Serializer(fileobj = fileobj, curve = curve)
+    s = Serializer(fileobj = fileobj, curve = curve, precision = precision, integral = integral)
     s.serialize()
 
 
-def serialize_str(curve):
-    """
+def serialize_str(curve, precision=5, integral=False):
+    r"""
     Serializes a passed Curve object to a string
+
+    >>> c = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(2, 1.123456789)])
+    >>> serialize_str(c, precision = "repr", integral = True).splitlines()[2:]
+    ['1\t1', '2\t1.123456789']
     """
     import StringIO
     fileobj = StringIO.StringIO()
-    s = Serializer(fileobj = fileobj, curve = curve)
+    s = Serializer(fileobj = fileobj, curve = curve, precision = precision, integral = integral)
     s.serialize()
     return fileobj.getvalue()
 
 
+def export(fileobj, curve, format, simplified=False):
+    """
+    Writes a Curve to the passed IO handle or file-path in one of the
+    formats of EXPORTERS ("nuke", "csv" or "json"), optionally simplifying it first
+    """
+    if format not in EXPORTERS:
+        raise ValueError("Unknown export format %r, expected one of %s" % (
+                format, ", ".join(sorted(EXPORTERS))))
+
+    if isinstance(fileobj, basestring):
+        with open(fileobj, "wb") as f:
+            return export(f, curve, format, simplified)
+
+    EXPORTERS[format](fileobj, curve, simplified=simplified).export()
+
+
+def export_directory(source_dir, dest_dir, format, simplified=False, workers=4):
+    """
+    Exports every framecurve file in ``source_dir`` into ``dest_dir`` in
+    one of the formats of EXPORTERS, converting up to ``workers`` files at
+    the same time in separate processes. The exported files are named
+    after the framecurve files, with the extension of the format. Returns
+    the paths written
+    """
+    if format not in EXPORTERS:
+        raise ValueError("Unknown export format %r, expected one of %s" % (
+                format, ", ".join(sorted(EXPORTERS))))
+
+    tasks = []
+    for name in sorted(os.listdir(source_dir)):
+        if not name.endswith(EXTENSION):
+            continue
+        dest_name = name[:-len(EXTENSION)] + EXPORTERS[format].EXTENSION
+        tasks.append((os.path.join(source_dir, name),
+                      os.path.join(dest_dir, dest_name), format, simplified))
+
+    if workers == 1:
+        return map(_export_file, tasks)
+    return _map_in_processes(_export_file, tasks, workers)
+
+
+def _export_file(task):
+    """
+    Exports one file for ``export_directory``, returning the path written
+    """
+    source, dest, format, simplified = task
+    with open(source) as fileobj:
+        curve = Parser(fileobj).parse()
+    export(dest, curve, format, simplified)
+    return dest
+
+
+def diff(before, after, tolerance=DELTA):
+    """
+    Compares the frame correlations of two properly sequenced curves and
+    returns the minimal list of changes needed to turn ``before`` into
+    ``after``, as ``(kind, old, new)`` tuples where ``kind`` is one of
+    "inserted", "removed" or "changed". Values closer than ``tolerance``
+    are considered the same. Comments are ignored
+
+    >>> a = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(2, 2.0)])
+    >>> b = Curve(values = [FrameCorrelation(2, 2.5), FrameCorrelation(3, 3.0)])
+    >>> for change in diff(a, b):
+    ...     print change
+    ('removed', FrameCorrelation(at=1, value=1.0), None)
+    ('changed', FrameCorrelation(at=2, value=2.0), FrameCorrelation(at=2, value=2.5))
+    ('inserted', None, FrameCorrelation(at=3, value=3.0))
+    """
+    old = list(before.frames())
+    new = list(after.frames())
+    _ensure_sequenced(old)
+    _ensure_sequenced(new)
+
+    changes = []
+    i, j = 0, 0
+    while i < len(old) and j < len(new):
+        o, n = old[i], new[j]
+        if o[0] < n[0]:
+            changes.append(("removed", o, None))
+            i += 1
+        elif o[0] > n[0]:
+            changes.append(("inserted", None, n))
+            j += 1
+        else:
+            if math.fabs(o[1] - n[1]) >= tolerance:
+                changes.append(("changed", o, n))
+            i += 1
+            j += 1
+
+    changes.extend(("removed", o, None) for o in old[i:])
+    changes.extend(("inserted", None, n) for n in new[j:])
+    return changes
+
+
+def max_deviation(before, after):
+    """
+    Returns the largest difference in source frame between two curves,
+    evaluated (with linear interpolation) at every frame either of the curves
+    has a keyframe at. Use it to tell whether two curves would give a
+    visibly different retime, even if their keyframes differ
+
+    >>> a = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(3, 3.0)])
+    >>> b = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(2, 2.5), FrameCorrelation(3, 3.0)])
+    >>> max_deviation(a, b)
+    0.5
+    """
+    old = list(before.frames())
+    new = list(after.frames())
+    if len(old) == 0 or len(new) == 0:
+        raise ValueError("Both curves must contain frame correlation records")
+
+    _ensure_sequenced(old)
+    _ensure_sequenced(new)
+
+    knots = sorted(set([x[0] for x in old]) | set([x[0] for x in new]))
+    deviations = [math.fabs(a - b) for a, b in
+                  zip(_sample(old, knots), _sample(new, knots))]
+    return max(deviations)
+
+
+def _ensure_sequenced(frames):
+    """
+    Raises a MalformedError if the passed list of FrameCorrelation objects
+    is not sorted by frame
+    """
+    for prev, current in zip(frames, frames[1:]):
+        if current[0] < prev[0]:
+            raise MalformedError(
+                "The frame sequencing is out of order (frame %d follows frame %d)" % (
+                    current[0], prev[0]))
+
+
+def _sample(frames, positions):
+    """
+    Linearly interpolates the source frame of a sorted list of
+    FrameCorrelation objects at every one of the ascending ``positions``,
+    in a single walk over both. Values before the first and after the
+    last keyframe are held
+    """
+    values = []
+    last = len(frames) - 1
+    idx = 0
+    for at in positions:
+        while idx < last and frames[idx + 1][0] <= at:
+            idx += 1
+
+        before_at, before_value = frames[idx]
+        if at <= before_at or idx == last:
+            values.append(float(before_value))
+            continue
+
+        after_at, after_value = frames[idx + 1]
+        t = (at - before_at) / float(after_at - before_at)
+        values.append(before_value + (after_value - before_value) * t)
+
+    return values
+
+
+def fingerprint(records, simplified=False):
+    r"""
+    Returns a hex digest of the frame correlations in ``records``, which
+    is either a Curve or any iterable of records (like the one returned
+    by ``iterparse``). Comments, the filename and the way the numbers were
+    written in the file do not affect the result. With ``simplified``,
+    the digest is computed over the simplified curve, so that retimes
+    that only differ in redundant keyframes give the same fingerprint.
+    The numbers are hashed in a fixed binary form, so the digest does not
+    depend on the platform or the Python version
+
+    >>> a = parse_str("# Some comment\r\n1\t1\r\n10\t10.0")
+    >>> b = parse_str("1\t1.00000\r\n10\t10.000")
+    >>> fingerprint(a) == fingerprint(b)
+    True
+    """
+    import struct
+    import hashlib
+
+    if simplified:
+        if not isinstance(records, Curve):
+            records = Curve(values=records)
+        records = simplify(records)
+
+    digest = hashlib.sha1()
+    for record in records:
+        if isinstance(record, FrameCorrelation):
+            # Adding 0.0 turns -0.0 into 0.0
+            digest.update(struct.pack("<qd", record[0], float(record[1]) + 0.0))
+
+    return digest.hexdigest()
+
+
+def parse_many(fileobjs, workers=4):
+    """
+    Parses many file-like objects or file-paths, reading up to
+    ``workers`` of them at the same time. Returns a list of Curve
+    objects in the same order as ``fileobjs``
+    """
+    return _map_concurrently(parse, fileobjs, workers)
+
+
+def validate_many(fileobjs, workers=4):
+    """
+    Validates many file-like objects or file-paths, reading up to
+    ``workers`` of them at the same time. Returns a list of Validator
+    objects in the same order as ``fileobjs``
+    """
+    return _map_concurrently(validate, fileobjs, workers)
+
+
+def serialize_many(pairs, workers=4):
+    """
+    Serializes a sequence of ``(fileobj, curve)`` pairs, writing up to
+    ``workers`` of them at the same time
+    """
+    def _serialize_pair(pair):
+        fileobj, curve = pair
+        serialize(fileobj, curve)
+
+    _map_concurrently(_serialize_pair, pairs, workers)
+
+
+def _map_concurrently(func, items, workers):
+    """
+    Calls ``func`` on every item using at most ``workers`` threads, and
+    returns the results in the order of ``items``. File reads and writes
+    release the GIL, so slow (network) storage is waited on in parallel.
+    The first exception raised by ``func`` is re-raised in the caller
+    """
+    import sys
+    import threading
+
+    if workers < 1:
+        raise ValueError("Need at least one worker, got %r" % (workers, ))
+
+    items = list(items)
+    results = [None] * len(items)
+    failures = []
+    lock = threading.Lock()
+    pending = iter(range(len(items)))
+
+    def _work():
+        while True:
+            with lock:
+                if failures:
+                    return
+                try:
+                    idx = pending.next()
+                except StopIteration:
+                    return
+            try:
+                results[idx] = func(items[idx])
+            except Exception:
+                with lock:
+                    failures.append(sys.exc_info())
+                return
+
+    threads = [threading.Thread(target=_work)
+               for _ in range(min(workers, len(items)))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if failures:
+        exc_type, exc_value, exc_tb = failures[0]
+        raise exc_type, exc_value, exc_tb
+
+    return results
+
+
 def simplify(curve):
     """
     Reduces the curve by removing all linear keyframes that could be interpolated, and returns the
@@ -473,11 +1707,15 @@ def _is_linear_segment(before, current, after):
     """
     Tells whether the three keyframes form a near-perfect linear segment
     """
-    dx = float(after.at) - float(before.at)
-    dy = float(after.value) - float(before.value)
-    t = (current.at - before.at) / dx
-    linear_y = before.value + (dy * t)
-    return math.fabs(linear_y - float(current.value)) < DELTA
+    before_at, before_value = before
+    after_at, after_value = after
+    current_at, current_value = current
+
+    dx = float(after_at) - float(before_at)
+    dy = float(after_value) - float(before_value)
+    t = (current_at - before_at) / dx
+    linear_y = before_value + (dy * t)
+    return math.fabs(linear_y - float(current_value)) < DELTA
 
 
 def _reduction_pass(curve):
@@ -503,3 +1741,486 @@ def _reduction_pass(curve):
         del curve[i]
 
     return len(to_remove_at)
+
+
+def _frame(at, value):
+    """
+    Makes a FrameCorrelation without going through ``__new__``, for
+    use in loops over whole curves
+    """
+    return tuple.__new__(FrameCorrelation, (at, value))
+
+
+def transform(curve, at_scale=1, at_offset=0, value_scale=1.0, value_offset=0.0):
+    """
+    Returns a copy of the curve where every frame correlation has been
+    moved to ``at * at_scale + at_offset`` (rounded to the nearest frame)
+    and given the value ``value * value_scale + value_offset``. Comments
+    are kept. A MalformedError is raised if two frames would be rounded
+    to the same one, so to shorten a curve use ``convert_frame_rate``
+    instead of scaling ``at``
+
+    >>> c = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(2, 2.0)])
+    >>> transform(c, at_offset = 100, value_scale = 2)
+    [FrameCorrelation(at=101, value=2.0), FrameCorrelation(at=102, value=4.0)]
+    """
+    records = []
+    sources = {}
+    for r in curve:
+        if isinstance(r, FrameCorrelation):
+            at = int(round(r[0] * at_scale + at_offset))
+            if sources.setdefault(at, r[0]) != r[0]:
+                raise MalformedError(
+                    "Frames %d and %d would both be moved to frame %d" % (
+                        sources[at], r[0], at))
+            r = _frame(at, r[1] * value_scale + value_offset)
+        records.append(r)
+    return Curve(filename=curve.filename, values=records)
+
+
+def trim(curve, start_at, end_at):
+    """
+    Returns the frame correlations of the curve from ``start_at`` to
+    ``end_at`` inclusive, without any comments. If the curve has no
+    keyframe on ``start_at`` or ``end_at`` one is interpolated, so the
+    trimmed curve gives the same retime over that range
+
+    >>> c = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(11, 21.0)])
+    >>> trim(c, 5, 8)
+    [FrameCorrelation(at=5, value=9.0), FrameCorrelation(at=8, value=15.0)]
+    """
+    _ensure_sequenced(list(curve.frames()))
+    return Curve(values=curve.window(start_at, end_at, interpolate=True).frames())
+
+
+def convert_frame_rate(curve, from_fps, to_fps, convert_source=True):
+    """
+    Resamples a curve recorded at ``from_fps`` to ``to_fps`` (use
+    ``24000 / 1001.0`` for 23.976 and so on), returning a curve with a
+    keyframe on every frame and no comments. Frame 1 stays at frame 1.
+    When ``convert_source`` is set the source footage is assumed to have
+    been converted too, so the values are rescaled the same way. Run
+    ``simplify`` on the result to drop the keyframes on linear segments
+
+    >>> c = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(26, 26.0)])
+    >>> converted = convert_frame_rate(c, 25, 24)
+    >>> converted[0], converted[-1]
+    (FrameCorrelation(at=1, value=1.0), FrameCorrelation(at=25, value=25.0))
+    """
+    frames = list(curve.frames())
+    _ensure_sequenced(frames)
+    if len(frames) == 0:
+        return Curve()
+
+    ratio = float(to_fps) / float(from_fps)
+    first = int(math.ceil((frames[0][0] - 1) * ratio - DELTA)) + 1
+    last = int(math.floor((frames[-1][0] - 1) * ratio + DELTA)) + 1
+
+    new_ats = range(first, last + 1)
+    values = _sample(frames, [1 + (at - 1) / ratio for at in new_ats])
+    if convert_source:
+        values = [1 + (v - 1) * ratio for v in values]
+
+    return Curve(values=map(_frame, new_ats, values))
+
+
+def concatenate(curves, offsets=None, overlap="last", gap="keep"):
+    """
+    Assembles many properly sequenced curves (for instance, one for every
+    shot of an edit) into a single curve, moving the frames of every
+    curve by the matching entry of ``offsets``. The curves are merged in
+    one pass, and the result has no comments.
+
+    Where the frame ranges of curves overlap, ``overlap`` decides which
+    one is used: "last" prefers the curve that comes later in ``curves``,
+    "first" the earlier one, and "error" raises a MalformedError. Keyframes
+    of the other curve within that range are dropped, and keyframes
+    interpolated from it are added on the frames around the range, so
+    that every frame still evaluates as in the curve it is taken from.
+
+    Where no curve covers a range of frames, ``gap`` decides what happens:
+    "keep" leaves the gap to be interpolated over, "hold" holds the last
+    value until the frame before the next curve starts, and "error"
+    raises a MalformedError.
+
+    A MalformedError is also raised if any of the curves is out of
+    sequence, or if a resulting frame would not be valid
+
+    >>> a = Curve(values = [FrameCorrelation(1, 1.0), FrameCorrelation(10, 10.0)])
+    >>> b = Curve(values = [FrameCorrelation(1, 50.0), FrameCorrelation(5, 54.0)])
+    >>> concatenate([a, b], offsets = [0, 10])
+    [FrameCorrelation(at=1, value=1.0), FrameCorrelation(at=10, value=10.0), FrameCorrelation(at=11, value=50.0), FrameCorrelation(at=15, value=54.0)]
+    """
+    import heapq
+
+    if overlap not in ("first", "last", "error"):
+        raise ValueError("Unknown overlap policy %r" % (overlap, ))
+    if gap not in ("keep", "hold", "error"):
+        raise ValueError("Unknown gap policy %r" % (gap, ))
+
+    curves = list(curves)
+    if offsets is None:
+        offsets = [0] * len(curves)
+    offsets = list(offsets)
+    if len(offsets) != len(curves):
+        raise ValueError("Need one offset per curve, got %d offsets for %d curves" % (
+                len(offsets), len(curves)))
+
+    spans = []
+    for idx, (curve, offset) in enumerate(zip(curves, offsets)):
+        first, last = _frame_from(curve, 0), _frame_before(curve, len(curve))
+        if first is not None:
+            spans.append((first[0] + offset, last[0] + offset, idx))
+    spans.sort()
+
+    if overlap == "error":
+        covered_to = None
+        for start, end, idx in spans:
+            if covered_to is not None and start <= covered_to:
+                raise MalformedError(
+                    "The curve at position %d overlaps another one from frame %d" % (
+                        idx, start))
+            covered_to = max(covered_to, end)
+
+    def _keys(idx):
+        offset = offsets[idx]
+        prev = None
+        for record in curves[idx].frames():
+            at = record[0] + offset
+            if prev is not None and at < prev:
+                raise MalformedError(
+                    "The frame sequencing of the curve at position %d is out of order"
+                    " (frame %d follows frame %d)" % (idx, record[0], prev - offset))
+            if prev == at:
+                raise MalformedError(
+                    "The curve at position %d contains the same frame (%d) twice or more" % (
+                        idx, record[0]))
+            prev = at
+            yield at, idx, record[1]
+
+    # The frame ranges every curve is used for, as (first, last, idx)
+    pick = overlap == "first" and min or max
+    owned = []
+    active = []
+    next_span = 0
+    bounds = sorted(set([span[0] for span in spans] + [span[1] + 1 for span in spans]))
+    for lo, hi in zip(bounds, bounds[1:]):
+        while next_span < len(spans) and spans[next_span][0] <= lo:
+            active.append(spans[next_span])
+            next_span += 1
+        active = [span for span in active if span[1] >= lo]
+        if len(active) == 0:
+            continue
+
+        idx = pick([span[2] for span in active])
+        if len(owned) > 0 and owned[-1][2] == idx and owned[-1][1] == lo - 1:
+            owned[-1] = (owned[-1][0], hi - 1, idx)
+        else:
+            owned.append((lo, hi - 1, idx))
+
+    out = []
+    current = 0
+
+    for at, idx, value in heapq.merge(*[_keys(i) for i in range(len(curves))]):
+        while current < len(owned) and owned[current][1] < at:
+            current += 1
+        if current == len(owned) or owned[current][0] > at or owned[current][2] != idx:
+            continue # another curve takes precedence here
+
+        if current > 0 and at == owned[current][0] and at > owned[current - 1][1] + 1:
+            if gap == "error":
+                raise MalformedError(
+                    "No curve covers the frames from %d to %d" % (owned[current - 1][1] + 1, at - 1))
+            elif gap == "hold":
+                out.append(_frame(at - 1, out[-1][1]))
+
+        if at < 1:
+            raise MalformedError(
+                "The curve at position %d would be placed at frame %d, below 1" % (idx, at))
+        if value < 0:
+            raise MalformedError(
+                "The curve at position %d has a use_frame_of_source value (%.5f) below 0" % (
+                    idx, value))
+
+        out.append(_frame(at, value))
+
+    # Where a curve is used for only part of its frames, it needs keys on
+    # both ends of that part so the frames around it are not changed
+    boundaries = []
+    for first, last, idx in owned:
+        offset = offsets[idx]
+        for at in (first, last):
+            key = _key_between(curves[idx], at - offset)
+            if key is not None and (len(boundaries) == 0 or boundaries[-1][0] != at):
+                boundaries.append(_frame(at, key[1]))
+    if len(boundaries) > 0:
+        out = list(heapq.merge(out, boundaries))
+
+    return Curve(values=out)
+
+
+_CLI_USAGE = """usage: framecurve COMMAND [options] [PATH ...]
+
+Commands:
+  validate   check files against the specification
+  simplify   remove keyframes on linear segments
+  convert    offset, scale or change the frame rate of curves
+  stats      print a summary line for every file
+  diff       compare two curves
+  cat        write out the records of all files, one after another
+
+Paths default to standard input, which can also be given as "-".
+Run "framecurve COMMAND --help" for the options of a command.
+"""
+
+
+def main(argv=None):
+    """
+    Runs the ``framecurve`` command line tool and returns its exit status:
+    0 on success, 1 if a curve is invalid (or differs, for ``diff``) and
+    2 if the command could not be run or its output was closed early
+    """
+    import sys
+    import errno
+    from optparse import OptionParser
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) == 0 or argv[0] not in _CLI_COMMANDS:
+        sys.stderr.write(_CLI_USAGE)
+        return 2
+
+    command = argv[0]
+    parser = OptionParser(usage="framecurve %s [options] [PATH ...]" % (command, ))
+    if command not in ("cat", "diff"):
+        # cat and diff stream their files in order, in this process
+        parser.add_option("-j", "--jobs", type="int", default=1,
+                          help="process up to JOBS files at the same time")
+    if command in ("simplify", "convert"):
+        parser.add_option("-o", "--output-dir",
+                          help="write the results into this directory (needed for more than one PATH)")
+        parser.add_option("--precision", default="5",
+                          help="decimals to write for source frames, or \"repr\" for the shortest exact form")
+        parser.add_option("--integral", action="store_true", default=False,
+                          help="write whole source frames without decimals")
+    if command == "convert":
+        parser.add_option("--from-fps", type="float", help="frame rate of the curve")
+        parser.add_option("--to-fps", type="float", help="frame rate to convert to")
+        parser.add_option("--offset", type="int", default=0, help="frames to move the curve by")
+        parser.add_option("--value-offset", type="float", default=0.0, help="added to every value")
+        parser.add_option("--value-scale", type="float", default=1.0, help="every value is multiplied by this")
+        parser.add_option("--simplify", action="store_true", default=False,
+                          help="simplify the converted curve")
+    if command == "diff":
+        parser.add_option("--tolerance", type="float", default=DELTA,
+                          help="values closer than this are the same")
+        parser.add_option("--max-deviation", action="store_true", default=False,
+                          help="only print the largest difference between the evaluated curves")
+
+    options, paths = parser.parse_args(argv[1:])
+    if len(paths) == 0:
+        paths = ["-"]
+
+    if getattr(options, "jobs", 1) < 1:
+        parser.error("--jobs must be 1 or more")
+    if paths.count("-") > 1:
+        parser.error("standard input can only be read once")
+    if command in ("simplify", "convert") and len(paths) > 1 and options.output_dir is None:
+        parser.error("--output-dir is needed to %s more than one file" % (command, ))
+    if command == "convert" and (options.from_fps is None) != (options.to_fps is None):
+        parser.error("--from-fps and --to-fps go together")
+    if command == "diff" and len(paths) != 2:
+        parser.error("diff needs exactly two paths")
+    if command in ("simplify", "convert") and options.precision != "repr":
+        if not options.precision.isdigit():
+            parser.error("--precision must be a number of decimals or \"repr\"")
+        options.precision = int(options.precision)
+
+    try:
+        return _cli_dispatch(command, paths, options)
+    except IOError, e:
+        if e.errno != errno.EPIPE:
+            raise
+        # Whatever reads the output stopped early (as with "| head"),
+        # keep the interpreter from failing to flush it again on exit
+        try:
+            fd = sys.stdout.fileno()
+        except (AttributeError, ValueError):
+            pass
+        else:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), fd)
+        return 2
+
+
+def _cli_dispatch(command, paths, options):
+    """
+    Runs ``command`` on ``paths`` and returns the exit status for main
+    """
+    import sys
+
+    if command in ("cat", "diff"):
+        return _CLI_COMMANDS[command](paths, vars(options), sys.stdout, sys.stderr)
+
+    tasks = [(command, path, vars(options)) for path in paths]
+    if options.jobs == 1 or "-" in paths:
+        results = map(_cli_run, tasks)
+    else:
+        results = _map_in_processes(_cli_run, tasks, options.jobs)
+
+    status = 0
+    if command == "stats":
+        sys.stdout.write("# path\tframes\tfirst_at\tlast_at\tmin_value\tmax_value\tsimplified_frames\n")
+    for task_status, out, err in results:
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+        status = max(status, task_status)
+
+    return status
+
+
+def _map_in_processes(func, items, workers):
+    """
+    Calls ``func`` on every item in a pool of ``workers`` processes, and
+    returns the results in the order of ``items``
+    """
+    import multiprocessing
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _cli_read(path):
+    """
+    Parses the curve at ``path``, or from standard input if it is "-"
+    """
+    import sys
+
+    if path == "-":
+        # Iterating keeps Parser from taking "<stdin>" as the filename
+        return Parser(iter(sys.stdin)).parse()
+
+    with open(path) as fileobj:
+        return Parser(fileobj).parse()
+
+
+def _cli_run(task):
+    """
+    Runs a command on one path, returning ``(status, output, errors)``
+    """
+    command, path, options = task
+    try:
+        curve = _cli_read(path)
+        return _CLI_COMMANDS[command](path, curve, options)
+    except MalformedError, e:
+        if command == "validate":
+            return 1, "%s: error: %s\n" % (path, e), ""
+        return 2, "", "framecurve: %s: %s\n" % (path, e)
+    except (EnvironmentError, FramecurveError), e:
+        return 2, "", "framecurve: %s: %s\n" % (path, e)
+
+
+def _cli_validate(path, curve, options):
+    v = Validator(curve=curve)
+    lines = ["%s: error: %s\n" % (path, e) for e in v.errors]
+    lines.extend(["%s: warning: %s\n" % (path, w) for w in v.warnings])
+    if len(lines) == 0:
+        lines.append("%s: ok\n" % (path, ))
+    return (not v.ok) and 1 or 0, "".join(lines), ""
+
+
+def _cli_stats(path, curve, options):
+    frames = list(curve.frames())
+    if len(frames) == 0:
+        return 1, "%s\t0\t-\t-\t-\t-\t0\n" % (path, ), ""
+
+    values = [f[1] for f in frames]
+    line = "%s\t%d\t%d\t%d\t%.05f\t%.05f\t%d\n" % (
+        path, len(frames), frames[0][0], frames[-1][0],
+        min(values), max(values), len(simplify(curve)))
+    return 0, line, ""
+
+
+def _cli_rewrite(path, curve, options):
+    if options.get("from_fps") is not None:
+        curve = convert_frame_rate(curve, options["from_fps"], options["to_fps"])
+    if options.get("offset") or options.get("value_offset") or options.get("value_scale", 1.0) != 1.0:
+        curve = transform(curve, at_offset=options["offset"],
+                          value_scale=options["value_scale"],
+                          value_offset=options["value_offset"])
+    if options.get("simplify", True):
+        curve = simplify(curve)
+
+    if options["output_dir"] is None:
+        return 0, serialize_str(curve, options["precision"], options["integral"]), ""
+
+    name = path == "-" and "stdin" + EXTENSION or os.path.basename(path)
+    with open(os.path.join(options["output_dir"], name), "wb") as fileobj:
+        Serializer(fileobj=fileobj, curve=curve,
+                   precision=options["precision"], integral=options["integral"]).serialize()
+    return 0, "", ""
+
+
+def _cli_cat(paths, options, out, err):
+    import sys
+
+    failed = []
+
+    def _read(path):
+        # Only errors reading the path are reported here, the ones
+        # writing to ``out`` are left to main
+        try:
+            if path == "-":
+                records = Parser(iter(sys.stdin)).iterparse()
+            else:
+                records = iterparse(path)
+            for record in records:
+                yield record
+        except (EnvironmentError, FramecurveError), e:
+            err.write("framecurve: %s: %s\n" % (path, e))
+            failed.append(path)
+
+    for path in paths:
+        for record in _read(path):
+            out.write(_to_utf8("%s\r\n" % (record, )))
+    return len(failed) > 0 and 2 or 0
+
+
+def _cli_diff(paths, options, out, err):
+    try:
+        before, after = [_cli_read(path) for path in paths]
+        if options["max_deviation"]:
+            deviation = max_deviation(before, after)
+            out.write("%.05f\n" % (deviation, ))
+            return deviation >= options["tolerance"] and 1 or 0
+
+        changes = diff(before, after, tolerance=options["tolerance"])
+    except (EnvironmentError, FramecurveError, ValueError), e:
+        err.write("framecurve: %s\n" % (e, ))
+        return 2
+
+    for kind, old, new in changes:
+        if old is not None:
+            out.write("-%s\n" % (old, ))
+        if new is not None:
+            out.write("+%s\n" % (new, ))
+    return len(changes) > 0 and 1 or 0
+
+
+_CLI_COMMANDS = {
+    "validate": _cli_validate,
+    "simplify": _cli_rewrite,
+    "convert": _cli_rewrite,
+    "stats": _cli_stats,
+    "diff": _cli_diff,
+    "cat": _cli_cat,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
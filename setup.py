@@ -28,6 +28,10 @@ See http://framecurve.org/ for more information
 
 py_modules = ['framecurve'],
 
+entry_points = {
+        'console_scripts': ['framecurve = framecurve:main'],
+},
+
 classifiers=[
         "Development Status :: 4 - Beta",
         #"Development Status :: 5 - Production/Stable",
@@ -0,0 +1,52 @@
+"""Measures how long short-lived processes spend in framecurve: importing
+it, and importing it to look up a single frame of a file.
+
+Run it with "python test/bench_startup.py". It exits with status 1 if
+the import goes over IMPORT_BUDGET.
+"""
+
+import os
+import sys
+import subprocess
+
+
+# Budget for "import framecurve" in a fresh interpreter, in seconds. It is
+# far above what the import takes, but well below what pulling in one of
+# the optional subsystems (NumPy, multiprocessing...) at import would cost
+IMPORT_BUDGET = 0.05
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, "test", "fixtures", "framecurves", "huge.framecurve.txt")
+
+CASES = [
+    ("import", "import framecurve"),
+    ("import + evaluate one frame", "import framecurve; framecurve.evaluate(%r, 50)" % (FIXTURE, )),
+    ("import + parse + evaluate", "import framecurve; framecurve.parse(%r).freeze().evaluate(50)" % (FIXTURE, )),
+    ]
+
+
+def best_of(code, runs=10):
+    timer = ("import time\n"
+             "start = time.time()\n"
+             "%s\n"
+             "print time.time() - start\n") % (code, )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT
+
+    times = []
+    for _ in range(runs):
+        proc = subprocess.Popen([sys.executable, "-c", timer], stdout=subprocess.PIPE, env=env)
+        out, _ = proc.communicate()
+        times.append(float(out))
+    return min(times)
+
+
+if __name__ == "__main__":
+    status = 0
+    for name, code in CASES:
+        best = best_of(code)
+        print "%-30s %.2f ms" % (name, best * 1000)
+        if name == "import" and best > IMPORT_BUDGET:
+            print "  over the budget of %.2f ms" % (IMPORT_BUDGET * 1000, )
+            status = 1
+    sys.exit(status)
@@ -0,0 +1,182 @@
+import os
+import sys
+import shutil
+import tempfile
+import StringIO
+import framecurve
+
+
+FIXTURES = os.path.dirname(__file__) + "/fixtures/framecurves/"
+
+
+def _run(args, stdin=""):
+    old = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin = StringIO.StringIO(stdin)
+    sys.stdout, sys.stderr = StringIO.StringIO(), StringIO.StringIO()
+    try:
+        status = framecurve.main(args)
+        return status, sys.stdout.getvalue(), sys.stderr.getvalue()
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = old
+
+
+def test_usage():
+    status, out, err = _run([])
+    assert status == 2
+    assert "usage" in err
+    assert _run(["frobnicate"])[0] == 2
+
+
+def test_validate():
+    good = FIXTURES + "sample_framecurve1.framecurve.txt"
+    bad = FIXTURES + "err-neg-frames.framecurve.txt"
+
+    status, out, err = _run(["validate", good])
+    assert status == 0
+    assert out == "%s: ok\n" % (good, )
+
+    status, out, err = _run(["validate", "-j", "2", good, bad])
+    assert status == 1
+    assert out.startswith("%s: ok\n%s: error: " % (good, bad))
+
+
+def test_validate_stdin():
+    status, out, err = _run(["validate"], stdin="foobar")
+    assert status == 1
+    assert out == "-: error: Malformed line 1: 'foobar'\n"
+
+
+def test_missing_file():
+    status, out, err = _run(["stats", "/tmp/does-not-exist.framecurve.txt"])
+    assert status == 2
+    assert err.startswith("framecurve: /tmp/does-not-exist.framecurve.txt: ")
+
+
+def test_simplify_stdin_to_stdout():
+    status, out, err = _run(["simplify"], stdin="1\t1.0\r\n2\t2.0\r\n3\t3.0\r\n")
+    assert status == 0
+    assert framecurve.parse_str(out) == framecurve.Curve(values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.Comment(framecurve.COLUMN_HEADER),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(3, 3.0)])
+
+
+def test_convert_many_into_directory():
+    outdir = tempfile.mkdtemp()
+    try:
+        paths = [FIXTURES + "sample_framecurve1.framecurve.txt", FIXTURES + "huge.framecurve.txt"]
+        status, out, err = _run(["convert", "--offset", "10", "-o", outdir, "-j", "2"] + paths)
+        assert status == 0
+        assert sorted(os.listdir(outdir)) == ["huge.framecurve.txt", "sample_framecurve1.framecurve.txt"]
+
+        converted = framecurve.parse(os.path.join(outdir, "sample_framecurve1.framecurve.txt"))
+        assert [x.at for x in converted.frames()] == [11, 15, 19, 25]
+    finally:
+        shutil.rmtree(outdir)
+
+
+def test_convert_needs_output_dir_for_many():
+    paths = [FIXTURES + "sample_framecurve1.framecurve.txt", FIXTURES + "huge.framecurve.txt"]
+    try:
+        _run(["convert"] + paths)
+    except SystemExit, e:
+        assert e.code == 2
+    else:
+        raise AssertionError("Expected usage error")
+
+
+def test_convert_frame_rate():
+    status, out, err = _run(["convert", "--from-fps", "25", "--to-fps", "24", "--simplify"],
+                            stdin="1\t1.0\r\n26\t26.0\r\n")
+    assert status == 0
+    assert list(framecurve.parse_str(out).frames()) == [
+        framecurve.FrameCorrelation(1, 1.0), framecurve.FrameCorrelation(25, 25.0)]
+
+
+def test_stats():
+    status, out, err = _run(["stats", FIXTURES + "sample_framecurve1.framecurve.txt"])
+    assert status == 0
+    lines = out.splitlines()
+    assert lines[0].startswith("# path")
+    assert lines[1].split("\t")[1:] == ["4", "1", "15", "1.00000", "25.76400", "4"]
+
+
+def test_diff():
+    old = FIXTURES + "sample_framecurve1.framecurve.txt"
+    status, out, err = _run(["diff", old, "-"], stdin="1\t1\r\n5\t12.34\r\n9\t15.678\r\n15\t25.764\r\n")
+    assert (status, out) == (0, "")
+
+    status, out, err = _run(["diff", old, "-"], stdin="1\t1\r\n5\t12.34\r\n9\t16.0\r\n")
+    assert status == 1
+    assert out == "-9\t15.67800\n+9\t16.00000\n-15\t25.76400\n"
+
+    status, out, err = _run(["diff", "--max-deviation", "--tolerance", "2", old, "-"],
+                            stdin="1\t1\r\n5\t12.34\r\n9\t16.0\r\n15\t25.764\r\n")
+    assert (status, out) == (0, "0.32200\n")
+
+
+def test_cat():
+    path = FIXTURES + "sample_framecurve1.framecurve.txt"
+    status, out, err = _run(["cat", path, "-"], stdin="20\t30")
+    assert status == 0
+    assert out.endswith("15\t25.76400\r\n20\t30.00000\r\n")
+    assert out.startswith("# http://framecurve.org/specification-v1\r\n")
+
+
+def test_simplify_precision():
+    status, out, err = _run(["simplify", "--precision", "repr", "--integral"],
+                            stdin="1\t1.0\r\n2\t2.5\r\n3\t3.125\r\n")
+    assert status == 0
+    assert out.endswith("1\t1\r\n2\t2.5\r\n3\t3.125\r\n")
+
+
+class _ClosedPipe(object):
+    def write(self, data):
+        import errno
+        raise IOError(errno.EPIPE, "Broken pipe")
+
+
+def test_closed_output():
+    path = FIXTURES + "sample_framecurve1.framecurve.txt"
+    for args in (["cat", path], ["diff", path, "-"], ["stats", path]):
+        old = sys.stdin, sys.stdout, sys.stderr
+        sys.stdin = StringIO.StringIO("1\t2\r\n")
+        sys.stdout, sys.stderr = _ClosedPipe(), StringIO.StringIO()
+        try:
+            status = framecurve.main(args)
+            errors = sys.stderr.getvalue()
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = old
+        assert status == 2
+        # Not reported as a problem with the input file
+        assert errors == "", errors
+
+
+def test_cat_reports_bad_files_and_goes_on():
+    good = FIXTURES + "sample_framecurve1.framecurve.txt"
+    status, out, err = _run(["cat", "missing.framecurve.txt", good])
+    assert status == 2
+    assert err.startswith("framecurve: missing.framecurve.txt: ")
+    assert out.endswith("15\t25.76400\r\n")
+
+
+def test_jobs_only_for_commands_using_them():
+    path = FIXTURES + "sample_framecurve1.framecurve.txt"
+    for args in (["cat", "-j", "2", path], ["diff", "-j", "2", path, path]):
+        try:
+            _run(args)
+        except SystemExit, e:
+            assert e.code == 2
+        else:
+            raise AssertionError("%s accepted -j" % (args[0], ))
+
+
+def test_non_ascii_comments_are_written_as_utf8():
+    stdin = "# caf\xc3\xa9\r\n1\t1\r\n"
+    status, out, err = _run(["cat"], stdin=stdin)
+    assert (status, out) == (0, "# caf\xc3\xa9\r\n1\t1.00000\r\n")
+
+    status, out, err = _run(["convert", "--offset", "5"], stdin=stdin)
+    assert status == 0
+    assert out.endswith("# caf\xc3\xa9\r\n6\t1.00000\r\n")
@@ -4,3 +4,54 @@ def test_init():
     assert c.text == "Very interesting \r\n comment"
     assert str(c) == "# Very interesting  comment"
     assert str(c) == c._to_framecurve()
+
+
+def test_no_instance_dict():
+    import framecurve
+    c = framecurve.Comment("Text")
+    f = framecurve.FrameCorrelation(1, 2.5)
+    assert not hasattr(c, "__dict__")
+    assert not hasattr(f, "__dict__")
+    assert (f.at, f.value) == (1, 2.5)
+
+
+def test_pickle():
+    import pickle
+    import framecurve
+    c = framecurve.Curve(filename = "a.framecurve.txt", values = [
+            framecurve.Comment("Text"), framecurve.FrameCorrelation(1, 2.5)])
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(c, protocol))
+        assert loaded == c
+        assert loaded.filename == c.filename
+
+
+def test_parsed_preamble_shares_strings():
+    import framecurve
+    data = "\r\n".join(["# " + framecurve.SPEC_URL, "# " + framecurve.COLUMN_HEADER,
+                        "# Repeated", "1\t1.0", "# Repeated"])
+    a = framecurve.parse_str(data)
+    b = framecurve.parse_str(data)
+    assert a[0].text is b[0].text
+    assert a[1].text is b[1].text
+    assert a[2].text is a[4].text
+    assert isinstance(a[0].text, unicode)
+
+
+def test_pickle_empty_comment():
+    import pickle
+    import framecurve
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(framecurve.Comment(""), protocol))
+        assert loaded.text == ""
+
+
+def test_unpickle_comment_pickled_before_slots():
+    import pickle
+    # Pickles of Comment("Text") as written by framecurve 0.3
+    old_pickles = [
+        "ccopy_reg\n_reconstructor\np0\n(cframecurve\nComment\np1\nc__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\nS'text'\np6\nS'Text'\np7\nsb.",
+        "\x80\x02cframecurve\nComment\nq\x00)\x81q\x01}q\x02U\x04textq\x03U\x04Textq\x04sb.",
+        ]
+    for data in old_pickles:
+        assert pickle.loads(data).text == "Text"
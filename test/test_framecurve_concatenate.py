@@ -0,0 +1,125 @@
+import framecurve
+
+
+def _pairs(curve):
+    return [(x.at, x.value) for x in curve.frames()]
+
+
+def test_concatenate_sequential_shots():
+    shots = [
+        framecurve.Curve(values = [
+                framecurve.FrameCorrelation(1, 1.0),
+                framecurve.FrameCorrelation(10, 10.0)]),
+        framecurve.Curve(values = [
+                framecurve.FrameCorrelation(1, 100.0),
+                framecurve.FrameCorrelation(5, 104.0)]),
+        framecurve.Curve(values = [framecurve.FrameCorrelation(1, 7.0)]),
+        ]
+    timeline = framecurve.concatenate(shots, offsets = [0, 10, 15])
+
+    assert _pairs(timeline) == [
+        (1, 1.0), (10, 10.0), (11, 100.0), (15, 104.0), (16, 7.0)]
+    assert framecurve.validate(curve = timeline).ok
+
+
+def test_concatenate_overlap_policies():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(10, 10.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(4, 40.0),
+            framecurve.FrameCorrelation(6, 60.0)])
+
+    assert _pairs(framecurve.concatenate([a, b])) == [
+        (1, 1.0), (3, 3.0), (4, 40.0), (6, 60.0), (7, 7.0), (10, 10.0)]
+    assert _pairs(framecurve.concatenate([a, b], overlap = "first")) == [
+        (1, 1.0), (5, 5.0), (10, 10.0)]
+
+    try:
+        framecurve.concatenate([a, b], overlap = "error")
+    except framecurve.MalformedError:
+        pass
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_concatenate_shot_nested_in_another():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(20, 20.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 100.0),
+            framecurve.FrameCorrelation(4, 103.0)])
+    timeline = framecurve.concatenate([a, b], offsets = [0, 4])
+
+    assert _pairs(timeline) == [
+        (1, 1.0), (4, 4.0), (5, 100.0), (8, 103.0), (9, 9.0), (20, 20.0)]
+    frozen = timeline.freeze()
+    for at in range(1, 21):
+        if 5 <= at <= 8:
+            assert frozen.evaluate(at) == 100.0 + at - 5
+        else:
+            assert frozen.evaluate(at) == at, at
+
+    # The outer curve is used from the frame after the inner one ends,
+    # where it has no keyframe of its own
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 50.0),
+            framecurve.FrameCorrelation(3, 52.0)])
+    timeline = framecurve.concatenate([a, b, c], offsets = [0, 4, 9])
+    assert _pairs(timeline) == [
+        (1, 1.0), (4, 4.0), (5, 100.0), (8, 103.0), (9, 9.0),
+        (10, 50.0), (12, 52.0), (13, 13.0), (20, 20.0)]
+
+
+def test_concatenate_gap_policies():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(3, 3.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(10, 50.0),
+            framecurve.FrameCorrelation(12, 52.0)])
+
+    assert _pairs(framecurve.concatenate([a, b])) == [
+        (1, 1.0), (3, 3.0), (10, 50.0), (12, 52.0)]
+    assert _pairs(framecurve.concatenate([a, b], gap = "hold")) == [
+        (1, 1.0), (3, 3.0), (9, 3.0), (10, 50.0), (12, 52.0)]
+
+    try:
+        framecurve.concatenate([a, b], gap = "error")
+    except framecurve.MalformedError:
+        pass
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_concatenate_validates_while_merging():
+    bad_inputs = [
+        ([framecurve.Curve(values = [
+                framecurve.FrameCorrelation(5, 1.0),
+                framecurve.FrameCorrelation(2, 1.0)])], [0]),
+        ([framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0)])], [-3]),
+        ([framecurve.Curve(values = [framecurve.FrameCorrelation(1, -1.0)])], [0]),
+        ([framecurve.Curve(values = [
+                framecurve.FrameCorrelation(1, 1.0),
+                framecurve.FrameCorrelation(1, 1.0)])], [0]),
+        ]
+
+    for curves, offsets in bad_inputs:
+        try:
+            framecurve.concatenate(curves, offsets)
+        except framecurve.MalformedError:
+            pass
+        else:
+            raise AssertionError("Expected MalformedError for %r" % (curves, ))
+
+
+def test_concatenate_needs_matching_offsets():
+    c = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0)])
+    try:
+        framecurve.concatenate([c], offsets = [1, 2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError")
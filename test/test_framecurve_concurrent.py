@@ -0,0 +1,52 @@
+import os
+import StringIO
+import framecurve
+
+
+FIXTURES = os.path.dirname(__file__) + "/fixtures/framecurves/"
+
+
+def test_parse_many_keeps_order():
+    paths = [FIXTURES + "sample_framecurve1.framecurve.txt",
+             FIXTURES + "huge.framecurve.txt",
+             FIXTURES + "sample_framecurve1.framecurve.txt"]
+    curves = framecurve.parse_many(paths, workers=2)
+
+    assert len(curves) == 3
+    assert [c.filename for c in curves] == [os.path.basename(p) for p in paths]
+    assert len(curves[1]) == 102
+    assert curves[0] == framecurve.parse(paths[0])
+
+
+def test_validate_many():
+    ios = [StringIO.StringIO("1\t1.0"), StringIO.StringIO("foobar")]
+    validators = framecurve.validate_many(ios)
+    assert validators[0].ok
+    assert validators[1].errors == ["Malformed line 1: 'foobar'"]
+
+
+def test_parse_many_reraises_errors():
+    ios = [StringIO.StringIO("1\t1.0"), StringIO.StringIO("foobar")]
+    try:
+        framecurve.parse_many(ios, workers=2)
+    except framecurve.MalformedError:
+        pass
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_serialize_many():
+    curve = framecurve.Curve(values = [framecurve.FrameCorrelation(10, 123)])
+    ios = [StringIO.StringIO(), StringIO.StringIO()]
+    framecurve.serialize_many([(io, curve) for io in ios])
+    for io in ios:
+        assert io.getvalue() == framecurve.serialize_str(curve)
+
+
+def test_needs_a_worker():
+    try:
+        framecurve.parse_many([], workers=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError")
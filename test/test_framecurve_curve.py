@@ -46,3 +46,86 @@ def test_frames_iter():
 
     assert ats == [1, 2, 3]
     assert values == [2.4, 3.0, 5.0]
+
+def test_window():
+    c = framecurve.Curve()
+    c.add_comment("Start")
+    for at in range(1, 11):
+        c.add_frame(at, at * 2.0)
+        if at == 5:
+            c.add_comment("Middle")
+
+    w = c.window(4, 6)
+    assert [x.at for x in w.frames()] == [4, 5, 6]
+    assert len(w) == 4
+    assert w[2].text == "Middle"
+    assert w[-1] == framecurve.FrameCorrelation(6, 12.0)
+    assert w.to_curve() == framecurve.Curve(values = list(w))
+
+    assert len(c.window(20, 30)) == 0
+    assert len(c.window(6, 4)) == 0
+    assert [x.at for x in c.window(-5, 2).frames()] == [1, 2]
+
+
+def test_window_comments_go_with_the_next_keyframe():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.Comment("Before 5"),
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.Comment("After 5")])
+
+    assert [str(x) for x in c.window(3, 5)] == ["# Before 5", "5\t5.00000"]
+    assert [str(x) for x in c.window(1, 1)] == ["1\t1.00000"]
+    assert list(c.window(3, 5, interpolate = True))[:2] == [
+        framecurve.FrameCorrelation(3, 3.0), framecurve.Comment("Before 5")]
+
+
+def test_window_reads_like_a_curve():
+    c = framecurve.Curve(filename = "shot.framecurve.txt", values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.Comment(framecurve.COLUMN_HEADER),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(11, 21.0)])
+    w = c.window(3, 6, interpolate = True)
+
+    assert w.filename == "shot.framecurve.txt"
+    assert w[:] == list(w)
+    assert w[1:] == [framecurve.FrameCorrelation(6, 11.0)]
+    assert framecurve.serialize_str(w) == framecurve.serialize_str(w.to_curve())
+    assert framecurve.validate(curve = w).errors == framecurve.validate(curve = w.to_curve()).errors
+
+    import StringIO
+    exported = StringIO.StringIO()
+    framecurve.export(exported, w, "json")
+    assert exported.getvalue().startswith('{"filename": "shot.framecurve.txt", "frames": [{"at": 3, ')
+
+
+def test_window_interpolates_boundaries():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(11, 21.0)])
+
+    w = c.window(3, 6, interpolate = True)
+    assert list(w) == [
+        framecurve.FrameCorrelation(3, 5.0),
+        framecurve.FrameCorrelation(6, 11.0)]
+    assert w[1] == framecurve.FrameCorrelation(6, 11.0)
+
+    w = c.window(1, 20, interpolate = True)
+    assert list(w) == list(c)
+
+
+def test_single_frame_window_between_keyframes():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(9, 13.0)])
+
+    w = c.window(6, 6, interpolate = True)
+    assert list(w) == [framecurve.FrameCorrelation(6, 7.0)]
+    assert len(w) == 1
+    assert w[0] == w[-1] == framecurve.FrameCorrelation(6, 7.0)
+
+    trimmed = framecurve.trim(c, 6, 6)
+    assert list(trimmed) == [framecurve.FrameCorrelation(6, 7.0)]
+    assert framecurve.Validator(curve = trimmed).errors == []
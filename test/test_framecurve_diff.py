@@ -0,0 +1,86 @@
+import framecurve
+
+
+def test_diff_of_identical_curves_is_empty():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(10, 12.5)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(10, 12.5)])
+    b.insert(0, framecurve.Comment("Comments are not compared"))
+    assert framecurve.diff(a, b) == []
+
+
+def test_diff_lists_changes_in_frame_order():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(10, 10.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(4, 4.0),
+            framecurve.FrameCorrelation(10, 11.0),
+            framecurve.FrameCorrelation(12, 13.0)])
+
+    changes = framecurve.diff(a, b)
+    assert [(kind, old and old.at, new and new.at) for kind, old, new in changes] == [
+        ("inserted", None, 4),
+        ("removed", 5, None),
+        ("changed", 10, 10),
+        ("inserted", None, 12)]
+
+
+def test_diff_tolerance():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.00001),
+            framecurve.FrameCorrelation(2, 2.5)])
+    assert len(framecurve.diff(a, b)) == 1
+    assert len(framecurve.diff(a, b, tolerance=1.0)) == 0
+
+
+def test_diff_refuses_out_of_order_curves():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(2, 1.0),
+            framecurve.FrameCorrelation(1, 1.0)])
+    b = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0)])
+    try:
+        framecurve.diff(a, b)
+    except framecurve.MalformedError:
+        pass
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_max_deviation_ignores_redundant_keys():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(11, 11.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(6, 6.0),
+            framecurve.FrameCorrelation(11, 11.0)])
+    assert framecurve.max_deviation(a, b) == 0.0
+
+
+def test_max_deviation_holds_ends():
+    a = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(5, 5.0)])
+    b = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(3, 3.0),
+            framecurve.FrameCorrelation(10, 3.0)])
+    assert framecurve.max_deviation(a, b) == 2.0
+
+
+def test_max_deviation_needs_frames():
+    b = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0)])
+    try:
+        framecurve.max_deviation(framecurve.Curve(), b)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError")
@@ -20,6 +20,7 @@ def test_framecorrelation_equal():
 
     assert a == a2
     assert a != b
+    assert not (a == b)
 
     assert a is a
     assert a is not b
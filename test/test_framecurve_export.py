@@ -0,0 +1,94 @@
+import os
+import json
+import shutil
+import tempfile
+import StringIO
+import framecurve
+
+
+FIXTURES = os.path.dirname(__file__) + "/fixtures/framecurves/"
+
+
+def _export(format, curve, **kwargs):
+    f = StringIO.StringIO()
+    framecurve.export(f, curve, format, **kwargs)
+    return f.getvalue()
+
+
+def test_export_nuke():
+    curve = framecurve.Curve(values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0),
+            framecurve.FrameCorrelation(3, 3.5)])
+    assert _export("nuke", curve) == "{curve L x1 1.0 x2 2.0 x3 3.5}\n"
+    assert _export("nuke", framecurve.Curve()) == "{curve L}\n"
+
+
+def test_export_csv():
+    curve = framecurve.Curve(values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0),
+            framecurve.FrameCorrelation(3, 3.5)])
+    assert _export("csv", curve) == "at_frame,use_frame_of_source\r\n1,1.0\r\n2,2.0\r\n3,3.5\r\n"
+
+
+def test_export_json():
+    curve = framecurve.Curve(filename = "shot.framecurve.txt", values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0),
+            framecurve.FrameCorrelation(3, 3.5)])
+    data = json.loads(_export("json", curve))
+    assert data == {
+        "filename": "shot.framecurve.txt",
+        "frames": [{"at": 1, "value": 1.0}, {"at": 2, "value": 2.0}, {"at": 3, "value": 3.5}]}
+    assert json.loads(_export("json", framecurve.Curve())) == {"filename": None, "frames": []}
+
+
+def test_export_integer_values():
+    curve = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 3),
+                                       framecurve.FrameCorrelation(2, 10 ** 20)])
+    assert _export("nuke", curve) == "{curve L x1 3.0 x2 1e+20}\n"
+    assert _export("csv", curve) == "at_frame,use_frame_of_source\r\n1,3.0\r\n2,1e+20\r\n"
+    assert json.loads(_export("json", curve))["frames"] == [
+        {"at": 1, "value": 3.0}, {"at": 2, "value": 1e20}]
+
+
+def test_export_simplified():
+    curve = framecurve.parse(FIXTURES + "huge.framecurve.txt")
+    rows = _export("csv", curve, simplified = True).splitlines()
+    assert len(rows) == 17
+
+
+def test_export_unknown_format():
+    try:
+        _export("xml", framecurve.Curve())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError")
+
+
+def test_export_directory():
+    source = tempfile.mkdtemp()
+    dest = tempfile.mkdtemp()
+    try:
+        for name in ("huge.framecurve.txt", "sample_framecurve1.framecurve.txt", "incorrect.extension"):
+            shutil.copy(FIXTURES + name, source)
+
+        written = framecurve.export_directory(source, dest, "json", simplified = True, workers = 2)
+        assert written == [os.path.join(dest, "huge.json"), os.path.join(dest, "sample_framecurve1.json")]
+        assert sorted(os.listdir(dest)) == ["huge.json", "sample_framecurve1.json"]
+
+        with open(os.path.join(dest, "huge.json")) as f:
+            data = json.load(f)
+        assert data["filename"] == "huge.framecurve.txt"
+        assert len(data["frames"]) == 16
+
+        assert framecurve.export_directory(source, dest, "nuke", workers = 1) == [
+            os.path.join(dest, "huge.nuke.txt"), os.path.join(dest, "sample_framecurve1.nuke.txt")]
+    finally:
+        shutil.rmtree(source)
+        shutil.rmtree(dest)
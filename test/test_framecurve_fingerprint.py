@@ -0,0 +1,47 @@
+import os
+import framecurve
+
+
+def test_fingerprint_ignores_comments_and_formatting():
+    a = framecurve.parse_str("# A comment\r\n1\t1\r\n2\t2.5")
+    b = framecurve.parse_str("1\t1.000\r\n# Another\r\n2\t2.50000")
+    assert framecurve.fingerprint(a) == framecurve.fingerprint(b)
+
+
+def test_fingerprint_sees_values():
+    a = framecurve.parse_str("1\t1.0\r\n2\t2.5")
+    b = framecurve.parse_str("1\t1.0\r\n2\t2.6")
+    c = framecurve.parse_str("1\t1.0\r\n3\t2.5")
+    assert framecurve.fingerprint(a) != framecurve.fingerprint(b)
+    assert framecurve.fingerprint(a) != framecurve.fingerprint(c)
+
+
+def test_fingerprint_simplified():
+    a = framecurve.parse_str("1\t1.0\r\n2\t2.0\r\n3\t3.0")
+    b = framecurve.parse_str("1\t1.0\r\n3\t3.0")
+    assert framecurve.fingerprint(a) != framecurve.fingerprint(b)
+    assert framecurve.fingerprint(a, simplified=True) == framecurve.fingerprint(b, simplified=True)
+
+
+def test_fingerprint_from_iterparse():
+    path = os.path.dirname(__file__) + "/fixtures/framecurves/huge.framecurve.txt"
+    curve = framecurve.parse(path)
+
+    assert framecurve.fingerprint(framecurve.iterparse(path)) == framecurve.fingerprint(curve)
+    assert framecurve.fingerprint(framecurve.iterparse(path), simplified=True) == \
+        framecurve.fingerprint(curve, simplified=True)
+
+
+def test_iterparse_yields_records():
+    path = os.path.dirname(__file__) + "/fixtures/framecurves/sample_framecurve1.framecurve.txt"
+    records = list(framecurve.iterparse(open(path)))
+    assert records == list(framecurve.parse(open(path)))
+
+
+def test_fingerprint_is_stable():
+    # Pinned, since fingerprints are meant to be stored and compared
+    # across platforms and Python versions
+    curve = framecurve.parse_str("1\t1\r\n2\t2.5")
+    assert framecurve.fingerprint(curve) == "d6e5ac03431160076eddfeb4632ad1b59865c7cc"
+    assert framecurve.fingerprint(framecurve.parse_str("1\t1\r\n2\t-0.0")) == \
+        framecurve.fingerprint(framecurve.parse_str("1\t1\r\n2\t0"))
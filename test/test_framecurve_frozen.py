@@ -0,0 +1,109 @@
+import threading
+import framecurve
+
+
+def test_freeze_precomputes():
+    c = framecurve.Curve(filename = "shot.framecurve.txt", values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.Comment(framecurve.COLUMN_HEADER),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0),
+            framecurve.FrameCorrelation(3, 3.0),
+            framecurve.FrameCorrelation(10, 24.0)])
+    frozen = c.freeze()
+    assert frozen.filename == "shot.framecurve.txt"
+    assert frozen.ats == (1, 2, 3, 10)
+    assert frozen.values == (1.0, 2.0, 3.0, 24.0)
+    assert frozen.ok and frozen.perfect
+    assert frozen.errors == ()
+    assert [x.at for x in frozen.simplified] == [1, 3, 10]
+    assert list(frozen.frames()) == list(c.frames())
+    assert frozen.thaw() == c
+
+
+def test_frozen_curve_reports_errors():
+    c = framecurve.Curve(values = [framecurve.FrameCorrelation(-1, 1.0)])
+    frozen = c.freeze()
+    assert not frozen.ok
+    assert list(frozen.errors) == framecurve.Validator(curve = c).errors
+    assert list(frozen.warnings) == framecurve.Validator(curve = c).warnings
+
+
+def test_frozen_curve_is_immutable():
+    frozen = framecurve.Curve(filename = "shot.framecurve.txt", values = [
+            framecurve.FrameCorrelation(1, 1.0)]).freeze()
+    for attempt in (lambda: setattr(frozen, "filename", "x"),
+                    lambda: delattr(frozen, "ats"),
+                    lambda: frozen.append(1)):
+        try:
+            attempt()
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("FrozenCurve should not be changeable")
+
+
+def test_frozen_curve_is_hashable():
+    c = framecurve.Curve(filename = "shot.framecurve.txt", values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(10, 24.0)])
+    a, b = c.freeze(), c.freeze()
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len(set([a, b])) == 1
+
+    c.filename = None
+    assert c.freeze() != a
+
+
+def test_frozen_curve_evaluate_from_threads():
+    frozen = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(3, 3.0),
+            framecurve.FrameCorrelation(10, 24.0)]).freeze()
+    failures = []
+
+    def _read():
+        for at in range(0, 12):
+            expected = at <= 3 and max(at, 1) or 3.0 + (at - 3) * 3
+            if at > 10:
+                expected = 24.0
+            if frozen.evaluate(at) != expected:
+                failures.append(at)
+
+    threads = [threading.Thread(target = _read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert failures == []
+
+
+def test_frozen_curves_with_empty_comments_hash_equal():
+    a = framecurve.Curve(values = [framecurve.Comment(""), framecurve.FrameCorrelation(1, 1.0)]).freeze()
+    b = framecurve.Curve(values = [framecurve.Comment(""), framecurve.FrameCorrelation(1, 1.0)]).freeze()
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len(set([a, b])) == 1
+
+
+def test_frozen_curves_with_comments_compare_with_any_other():
+    a = framecurve.Curve(values = [framecurve.Comment("x"), framecurve.FrameCorrelation(1, 1.0)]).freeze()
+    b = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0), framecurve.FrameCorrelation(2, 2.0)]).freeze()
+    assert a != b
+    assert not a == b
+    assert len(set([a, b, a])) == 2
+
+
+def test_frozen_curve_out_of_order():
+    frozen = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(10, 10.0)]).freeze()
+    assert not frozen.ok
+    assert frozen.ats == (1, 5, 10)
+    assert frozen.values == (1.0, 5.0, 10.0)
+    assert frozen.evaluate(3) == 3.0
+    assert [x.at for x in frozen.frames()] == [5, 1, 10]
@@ -0,0 +1,85 @@
+import os
+import framecurve
+
+from nose.plugins.skip import SkipTest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def setup():
+    if numpy is None:
+        raise SkipTest("NumPy is not installed")
+
+
+def _path():
+    return os.path.dirname(__file__) + "/fixtures/framecurves/sample_framecurve1.framecurve.txt"
+
+
+def test_to_numpy():
+    curve = framecurve.parse(_path())
+    ats, values = curve.to_numpy()
+    assert ats.tolist() == [1, 5, 9, 15]
+    assert values.tolist() == [1.0, 12.34, 15.678, 25.764]
+
+    records = curve.to_numpy(structured=True)
+    assert records["at"].tolist() == [1, 5, 9, 15]
+    assert records["value"].tolist() == values.tolist()
+
+
+def test_from_numpy():
+    curve = framecurve.Curve.from_numpy(
+        numpy.array([1, 2]), numpy.array([1.5, 2.5]), comments=["Hello"], filename="a.framecurve.txt")
+    assert curve.filename == "a.framecurve.txt"
+    assert curve == framecurve.Curve(values = [
+            framecurve.Comment("Hello"),
+            framecurve.FrameCorrelation(1, 1.5),
+            framecurve.FrameCorrelation(2, 2.5)])
+    assert type(curve[1].at) is int
+    assert type(curve[1].value) is float
+
+
+def test_from_numpy_needs_matching_lengths():
+    try:
+        framecurve.Curve.from_numpy(numpy.array([1, 2]), numpy.array([1.5]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError")
+
+
+def test_parse_into_preallocated_arrays():
+    ats = numpy.zeros(10, dtype="i8")
+    values = numpy.zeros(10, dtype="f8")
+    count = framecurve.Parser(open(_path())).parse_into(ats, values)
+
+    assert count == 4
+    assert ats[:count].tolist() == [1, 5, 9, 15]
+    assert values[:count].tolist() == [1.0, 12.34, 15.678, 25.764]
+
+    try:
+        framecurve.Parser(open(_path())).parse_into(ats[:2], values[:2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError")
+
+
+def test_shared_curve_to_numpy_does_not_copy():
+    with framecurve.share(framecurve.parse(_path())) as shared:
+        ats, values = shared.to_numpy()
+        assert ats.tolist() == [1, 5, 9, 15]
+        assert not values.flags.writeable
+
+        shared._values[0] = 2.0
+        assert values[0] == 2.0
+
+
+def test_frozen_curve_to_numpy():
+    frozen = framecurve.parse(_path()).freeze()
+    records = frozen.to_numpy(structured=True)
+    assert records["at"].tolist() == [1, 5, 9, 15]
+    ats, values = frozen.to_numpy()
+    assert values.tolist() == [1.0, 12.34, 15.678, 25.764]
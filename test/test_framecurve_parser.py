@@ -71,3 +71,39 @@ def test_parse_str_helper():
     print c1
     assert c1[0].at == 1
     assert c1[0].value == 2.0
+
+
+def test_parse_tolerant_collects_all_malformed_lines():
+    data = "# Comment\r\n1\t1.0\r\nfoo\r\n2\t2.0\r\n# caf\xc3\xa9\r\n3\t\xff\r\n\r\n4\t4.0"
+    curve, errors = framecurve.parse_tolerant(StringIO(data))
+
+    assert [x.at for x in curve.frames()] == [1, 2, 4]
+    assert curve[3].text == u"caf\xe9"
+    assert [(e.lineno, e.line) for e in errors] == [
+        (3, "foo\r\n"), (6, "3\t\xff\r\n"), (7, "\r\n")]
+    assert str(errors[0]) == "Malformed line 3: 'foo'"
+    assert all(isinstance(e, framecurve.MalformedError) for e in errors)
+
+
+def test_parse_raises_on_first_malformed_line():
+    try:
+        framecurve.parse(StringIO("1\t1.0\r\nfoo\r\nbar"))
+    except framecurve.MalformedError, e:
+        assert e.lineno == 2
+        assert e.line == "foo\r\n"
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_parse_rejects_invalid_utf8():
+    try:
+        framecurve.parse(StringIO("# \xff\xfe"))
+    except framecurve.MalformedError, e:
+        assert e.lineno == 1
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_parse_exponents():
+    curve = framecurve.parse_str("1\t1.2e3\r\n2\t1.5E-2\r\n3\t2e+1")
+    assert [x.value for x in curve.frames()] == [1200.0, 0.015, 20.0]
@@ -72,3 +72,107 @@ def test_serialise_str_helper():
     o1 = framecurve.serialize_str(c1)
     expected = """# http://framecurve.org/specification-v1\r\n# at_frame\tuse_frame_of_source\r\n1\t2.00000\r\n"""
     assert o1 == expected
+
+
+def _preamble():
+    return "# http://framecurve.org/specification-v1\r\n# at_frame\tuse_frame_of_source\r\n"
+
+
+def test_serialize_to_path():
+    import os
+    import shutil
+    import tempfile
+
+    curve = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.5)])
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "shot.framecurve.txt")
+        framecurve.serialize(path, curve)
+        # Written out in full, without waiting for the file to be collected
+        with open(path, "rb") as f:
+            assert f.read() == framecurve.serialize_str(curve)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_non_ascii_comments_are_written_as_utf8():
+    import os
+    import shutil
+    import tempfile
+
+    curve = framecurve.parse_str("# caf\xc3\xa9\r\n1\t1\r\n")
+    assert curve[0].text == u"caf\xe9"
+    assert framecurve.serialize_str(curve).endswith("# caf\xc3\xa9\r\n1\t1.00000\r\n")
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "shot.framecurve.txt")
+        framecurve.serialize(path, curve)
+        assert framecurve.parse(path)[2].text == u"caf\xe9"
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_precision_modes():
+    curve = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 10.0),
+            framecurve.FrameCorrelation(2, 10.123456789)])
+
+    assert framecurve.serialize_str(curve, precision = 2) == _preamble() + "1\t10.00\r\n2\t10.12\r\n"
+    assert framecurve.serialize_str(curve, precision = 0) == _preamble() + "1\t10\r\n2\t10\r\n"
+    assert framecurve.serialize_str(curve, integral = True) == _preamble() + "1\t10\r\n2\t10.12346\r\n"
+    assert framecurve.serialize_str(curve, precision = "repr") == _preamble() + "1\t10.0\r\n2\t10.123456789\r\n"
+
+
+def test_invalid_precision():
+    for precision in (-1, "fast", 2.5):
+        try:
+            framecurve.Serializer(StringIO.StringIO(), framecurve.Curve(), precision = precision)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Expected ValueError for %r" % (precision, ))
+
+
+def test_repr_precision_round_trips():
+    values = [1.0, 0.1, 1e-07, 123456789.123, 2.0 / 3, 1e22]
+    curve = framecurve.Curve(values = [framecurve.FrameCorrelation(i + 1, v) for i, v in enumerate(values)])
+
+    text = framecurve.serialize_str(curve, precision = "repr", integral = True)
+    assert [x.value for x in framecurve.parse_str(text).frames()] == values
+
+
+def test_repr_precision_with_integer_values():
+    curve = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 3),
+                                       framecurve.FrameCorrelation(2, 10 ** 20)])
+
+    text = framecurve.serialize_str(curve, precision = "repr")
+    assert text.endswith("1\t3.0\r\n2\t1e+20\r\n")
+    assert [x.value for x in framecurve.parse_str(text).frames()] == [3.0, 1e20]
+
+
+def test_integral_with_values_that_are_not_numbers():
+    curve = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 2.0),
+                                       framecurve.FrameCorrelation(2, float("inf")),
+                                       framecurve.FrameCorrelation(3, float("nan"))])
+
+    text = framecurve.serialize_str(curve, integral = True)
+    assert text.endswith("1\t2\r\n2\tinf\r\n3\tnan\r\n")
+
+
+def test_serialize_in_chunks_keeps_order_and_preamble():
+    curve = framecurve.Curve()
+    curve.add_comment(framecurve.SPEC_URL)
+    curve.add_comment(framecurve.COLUMN_HEADER)
+    for at in range(1, 3001):
+        curve.add_frame(at, at * 0.5)
+
+    s = StringIO.StringIO()
+    framecurve.serialize(s, curve)
+    lines = s.getvalue().split("\r\n")
+
+    assert len(curve) == 3002
+    assert len(lines) == 3003
+    assert lines[:3] == ["# http://framecurve.org/specification-v1", "# at_frame\tuse_frame_of_source", "1\t0.50000"]
+    assert lines[-2] == "3000\t1500.00000"
+    assert framecurve.parse_str(s.getvalue()) == curve
@@ -0,0 +1,74 @@
+import os
+import pickle
+import multiprocessing
+import framecurve
+
+
+_shared = None
+
+
+def _attach(shared):
+    global _shared
+    _shared = shared
+
+
+def _evaluate_in_worker(at):
+    return os.getpid(), _shared.evaluate(at)
+
+
+def _load():
+    path = os.path.dirname(__file__) + "/fixtures/framecurves/sample_framecurve1.framecurve.txt"
+    return framecurve.parse(path)
+
+
+def test_shared_curve_reads_like_the_curve():
+    curve = _load()
+    with framecurve.share(curve) as shared:
+        assert len(shared) == 4
+        assert shared[0] == framecurve.FrameCorrelation(1, 1.0)
+        assert shared[-1] == framecurve.FrameCorrelation(15, 25.764)
+        assert list(shared.frames()) == list(curve.frames())
+        assert shared.to_curve() == framecurve.Curve(values = list(curve.frames()))
+        assert shared.to_curve().filename == curve.filename
+
+        assert shared.evaluate(0) == 1.0
+        assert shared.evaluate(3) == 1.0 + (12.34 - 1.0) / 2
+        assert shared.evaluate(5) == 12.34
+        assert shared.evaluate(100) == 25.764
+
+
+def test_shared_curve_in_worker_processes():
+    shared = framecurve.share(_load())
+    pool = multiprocessing.Pool(2, initializer=_attach, initargs=(shared, ))
+    try:
+        results = pool.map(_evaluate_in_worker, [1, 5, 9, 15])
+    finally:
+        pool.close()
+        pool.join()
+        shared.close()
+
+    assert [value for pid, value in results] == [1.0, 12.34, 15.678, 25.764]
+    assert os.getpid() not in [pid for pid, value in results]
+
+
+def test_frame_correlations_pickle():
+    f = framecurve.FrameCorrelation(3, 4.5)
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(f, protocol)) == f
+
+
+def test_shared_curve_after_close():
+    shared = framecurve.share(_load())
+    assert not shared.closed
+    shared.close()
+    assert shared.closed
+
+    reads = [len, lambda s: s[0], lambda s: list(s.frames()),
+             lambda s: s.evaluate(1), lambda s: s.to_curve(), lambda s: s.to_numpy()]
+    for read in reads:
+        try:
+            read(shared)
+        except ValueError, e:
+            assert str(e) == "SharedCurve is closed"
+        else:
+            raise AssertionError("A closed SharedCurve was read")
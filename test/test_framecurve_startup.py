@@ -0,0 +1,66 @@
+import os
+import sys
+import subprocess
+import StringIO
+import framecurve
+
+
+LAZY_MODULES = ["re", "hashlib", "heapq", "bisect", "json", "threading",
+                "multiprocessing", "numpy", "optparse", "StringIO"]
+
+
+def _run_python(code):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, env=env)
+    out, _ = proc.communicate()
+    assert proc.returncode == 0
+    return out
+
+
+def test_import_does_not_load_optional_modules():
+    out = _run_python(
+        "import sys\n"
+        "before = set(sys.modules)\n"
+        "import framecurve\n"
+        "print ' '.join(sorted(set(sys.modules) - before))\n"
+        "print framecurve.Parser.__dict__['CORRELATION_RECORD'].compiled is None\n")
+    loaded, regex_uncompiled = out.splitlines()
+
+    assert [m for m in LAZY_MODULES if m in loaded.split()] == []
+    assert regex_uncompiled == "True"
+
+
+def test_evaluate_single_frame():
+    data = "# Comment\r\n1\t1.0\r\n# Another\r\n5\t9.0\r\n10\t10.0\r\n"
+    for at, expected in [(0, 1.0), (1, 1.0), (3, 5.0), (5, 9.0), (7, 9.4), (20, 10.0)]:
+        assert abs(framecurve.evaluate(StringIO.StringIO(data), at) - expected) < 1e-9
+
+
+def test_evaluate_stops_reading_after_frame():
+    data = "1\t1.0\r\n5\t9.0\r\nthis line is never read"
+    assert framecurve.evaluate(StringIO.StringIO(data), 2) == 3.0
+
+
+def test_evaluate_duplicate_frames_like_frozen_curve():
+    data = "1\t1.0\r\n5\t5.0\r\n5\t7.0\r\n9\t9.0\r\n"
+    frozen = framecurve.parse_str(data).freeze()
+    for at in range(0, 11):
+        assert framecurve.evaluate(StringIO.StringIO(data), at) == frozen.evaluate(at), at
+    assert framecurve.evaluate(StringIO.StringIO(data), 5) == 7.0
+    assert framecurve.evaluate(StringIO.StringIO("1\t1.0\r\n5\t5.0\r\n5\t7.0\r\n"), 5) == 7.0
+
+
+def test_evaluate_path():
+    path = os.path.dirname(__file__) + "/fixtures/framecurves/sample_framecurve1.framecurve.txt"
+    assert framecurve.evaluate(path, 5) == framecurve.parse(path).freeze().evaluate(5)
+
+
+def test_evaluate_errors():
+    for data in ["", "# Only a comment", "1\tfoo", "5\t1.0\r\n2\t3.0"]:
+        try:
+            framecurve.evaluate(StringIO.StringIO(data), 10)
+        except framecurve.MalformedError:
+            pass
+        else:
+            raise AssertionError("Expected MalformedError for %r" % (data, ))
@@ -0,0 +1,95 @@
+import framecurve
+
+
+def test_transform_keeps_comments_and_filename():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(10, 10.0)])
+    c.insert(0, framecurve.Comment("Hello"))
+    c.filename = "shot.framecurve.txt"
+
+    moved = framecurve.transform(c, at_offset=10, value_offset=-1)
+    assert moved.filename == "shot.framecurve.txt"
+    assert moved[0].text == "Hello"
+    assert list(moved.frames()) == [
+        framecurve.FrameCorrelation(11, 0.0), framecurve.FrameCorrelation(20, 9.0)]
+    assert isinstance(moved[1], framecurve.FrameCorrelation)
+
+
+def test_transform_rounds_scaled_frames():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(3, 3.0)])
+    assert list(framecurve.transform(c, at_scale=1.5).frames()) == [
+        framecurve.FrameCorrelation(2, 1.0), framecurve.FrameCorrelation(5, 3.0)]
+
+
+def test_transform_rounds_offset_frames():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(3, 3.0)])
+    moved = framecurve.transform(c, at_offset=0.5)
+    assert [x.at for x in moved.frames()] == [2, 4]
+    assert all(isinstance(x.at, int) for x in moved.frames())
+
+
+def test_transform_refuses_to_merge_frames():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0),
+            framecurve.FrameCorrelation(3, 3.0)])
+    try:
+        framecurve.transform(c, at_scale=0.5)
+    except framecurve.MalformedError:
+        pass
+    else:
+        raise AssertionError("Expected MalformedError")
+
+
+def test_trim_interpolates_boundaries():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(9, 13.0)])
+    assert framecurve.trim(c, 3, 7) == framecurve.Curve(values = [
+            framecurve.FrameCorrelation(3, 3.0),
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(7, 9.0)])
+    assert framecurve.trim(c, 5, 9) == framecurve.Curve(values = [
+            framecurve.FrameCorrelation(5, 5.0),
+            framecurve.FrameCorrelation(9, 13.0)])
+    assert framecurve.trim(c, 20, 30) == framecurve.Curve()
+    assert framecurve.trim(c, -5, 2) == framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0)])
+
+
+def test_convert_frame_rate_covers_whole_range():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(101, 201.0)])
+    converted = framecurve.convert_frame_rate(c, 25, 24)
+    frames = list(converted.frames())
+
+    assert frames[0] == framecurve.FrameCorrelation(1, 1.0)
+    assert frames[-1] == framecurve.FrameCorrelation(97, 193.0)
+    assert len(frames) == 97
+    assert framecurve.validate(curve=converted).ok
+
+
+def test_convert_frame_rate_without_source():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(26, 26.0)])
+    converted = framecurve.convert_frame_rate(c, 25, 24, convert_source=False)
+    assert converted[-1] == framecurve.FrameCorrelation(25, 26.0)
+    assert len(framecurve.simplify(converted)) == 2
+
+
+def test_convert_ntsc_rate():
+    c = framecurve.Curve(values = [
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(1001, 1001.0)])
+    converted = framecurve.convert_frame_rate(c, 24, 24000 / 1001.0)
+    assert converted[-1].at == 1000
+    assert abs(converted[-1].value - 1000.0) < framecurve.DELTA
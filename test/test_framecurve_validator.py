@@ -186,3 +186,109 @@ def test_should_fail_with_nothing_supplied():
         pass
     else:
         raise AssertionError("Validator should require an argument")
+
+
+def _assert_state_matches(c):
+    state = c.validation_state()
+    v = framecurve.Validator(curve = c)
+    assert state.errors == v.errors, (state.errors, v.errors)
+    assert state.warnings == v.warnings, (state.warnings, v.warnings)
+    assert state.ok == v.ok
+    assert state.perfect == v.perfect
+
+
+def test_validation_state_follows_appends():
+    c = framecurve.Curve(filename = "shot.framecurve.txt")
+    state = c.validation_state()
+    _assert_state_matches(c)
+
+    edits = [
+        lambda: c.add_comment(framecurve.SPEC_URL),
+        lambda: c.add_comment(framecurve.COLUMN_HEADER),
+        lambda: c.add_frame(1, 1.0),
+        lambda: c.add_frame(5, 4.0),
+        lambda: c.add_frame(3, 2.0),
+        lambda: c.add_frame(5, 6.0),
+        lambda: c.append(framecurve.FrameCorrelation(-2, 1.0)),
+        lambda: c.extend([framecurve.FrameCorrelation(7, -1.0), framecurve.Comment("x")]),
+        lambda: c.add_frame(5, 6.0),
+        ]
+    for edit in edits:
+        edit()
+        assert c.validation_state() is state
+        _assert_state_matches(c)
+
+    assert state.errors[-1].startswith("The frame sequencing is out of order")
+
+
+def test_validation_state_after_other_changes():
+    c = framecurve.Curve(values = [
+            framecurve.Comment(framecurve.SPEC_URL),
+            framecurve.Comment(framecurve.COLUMN_HEADER),
+            framecurve.FrameCorrelation(1, 1.0),
+            framecurve.FrameCorrelation(2, 2.0)])
+
+    edits = [
+        lambda: c.insert(2, framecurve.FrameCorrelation(3, 1.0)),
+        lambda: c.sort(key = lambda r: isinstance(r, framecurve.FrameCorrelation) and r.at or 0),
+        lambda: c.__setitem__(2, framecurve.FrameCorrelation(2, 1.0)),
+        lambda: c.pop(0),
+        lambda: c.__delitem__(slice(0, 1)),
+        lambda: c.__iadd__([framecurve.FrameCorrelation(0, 1.0)]),
+        lambda: c.reverse(),
+        ]
+    for edit in edits:
+        c.validation_state()
+        edit()
+        _assert_state_matches(c)
+
+
+def test_validation_state_is_not_shared_with_copies():
+    import copy
+    c = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0)])
+    state = c.validation_state()
+
+    c2 = copy.copy(c)
+    c2.add_frame(1, 1.0)
+    _assert_state_matches(c2)
+
+    assert state.ok
+    assert c.validation_state() is state
+    _assert_state_matches(c)
+
+
+def test_detached_validation_state_cannot_be_read():
+    edits = [
+        lambda c: c.insert(0, framecurve.FrameCorrelation(5, 1.0)),
+        lambda c: c.pop(),
+        lambda c: c.sort(),
+        lambda c: c.__setitem__(0, framecurve.FrameCorrelation(5, 1.0)),
+        ]
+    for edit in edits:
+        c = framecurve.Curve(values = [framecurve.FrameCorrelation(1, 1.0),
+                                       framecurve.FrameCorrelation(2, 1.0)])
+        state = c.validation_state()
+        edit(c)
+        for name in ("errors", "warnings", "ok", "perfect"):
+            try:
+                getattr(state, name)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("%s of a detached state was read" % name)
+        assert c.validation_state() is not state
+        _assert_state_matches(c)
+
+
+def test_validation_state_follows_filename():
+    c = framecurve.Curve(filename = "shot.framecurve.txt",
+                         values = [framecurve.FrameCorrelation(1, 1.0)])
+    state = c.validation_state()
+    assert state.ok
+
+    c.filename = "shot.txt"
+    assert not state.ok
+    _assert_state_matches(c)
+
+    c.filename = "shot.framecurve.txt"
+    assert state.ok